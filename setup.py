@@ -11,6 +11,10 @@ setup(
         "python-dotenv>=0.20.0",
         "WazeRouteCalculator>=0.15.0",
     ],
+    extras_require={
+        "fast": ["orjson>=3.9.0"],
+        "direct": ["httpx[http2]>=0.24.0"],
+    },
     entry_points={
         "console_scripts": [
             "waze-home=waze_home.cli:cli",
@@ -0,0 +1,67 @@
+"""Tests for the command line interface."""
+
+from click.testing import CliRunner
+from unittest.mock import patch
+
+from waze_home.cli import cli
+
+
+CLI_HELP = """\
+Usage: waze-home [OPTIONS] COMMAND [ARGS]...
+
+  Waze Home - Get the fastest route between home and work.
+
+Options:
+  --help  Show this message and exit.
+
+Commands:
+  home          Get the fastest route home from your current location (work).
+  locations     Get a named location or list all locations.
+  route         Get the fastest route between two locations.
+  set-location  Set a named location.
+  work          Get the fastest route to work from your current location...
+"""
+
+ROUTE_HELP = """\
+Usage: waze-home route [OPTIONS]
+
+  Get the fastest route between two locations.
+
+Options:
+  --from TEXT    Starting location (default: home)
+  --to TEXT      Destination location (default: work)
+  --no-cache     Ignore cached routes and fetch fresh data
+  --ttl INTEGER  Maximum age of a cached route in seconds (default:
+                 WAZE_HOME_CACHE_TTL or 120)
+  --help         Show this message and exit.
+"""
+
+
+def test_cli_help():
+    """Test the top-level help output."""
+    result = CliRunner().invoke(cli, ["--help"], prog_name="waze-home")
+
+    assert result.exit_code == 0
+    assert result.output == CLI_HELP
+
+
+def test_route_help():
+    """Test the route command help output."""
+    result = CliRunner().invoke(cli, ["route", "--help"], prog_name="waze-home")
+
+    assert result.exit_code == 0
+    assert result.output == ROUTE_HELP
+
+
+def test_route_options_passed_to_get_route():
+    """Test that route options reach get_route."""
+    with patch("waze_home.cli.get_route") as mock_get_route, \
+         patch("waze_home.cli.prefetch_route") as mock_prefetch:
+        mock_get_route.side_effect = Exception("No route found")
+        result = CliRunner().invoke(cli, ["home", "--no-cache", "--ttl", "30"])
+
+    assert result.exit_code == 1
+    assert "No route found" in result.output
+    _, kwargs = mock_get_route.call_args
+    assert kwargs == {"use_cache": False, "ttl": 30}
+    assert mock_prefetch.call_args == mock_get_route.call_args
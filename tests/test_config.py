@@ -1,20 +1,33 @@
 """Tests for the config module."""
 
 import pytest
-from unittest.mock import patch, mock_open
+from unittest.mock import patch
 import json
 import os
 
 from waze_home.config import (
     get_config,
+    save_config,
     set_location,
     get_location,
     DEFAULT_LOCATIONS,
 )
 
 
+@pytest.fixture(autouse=True)
+def config_path(tmp_path):
+    """Fixture to point the config file at a temporary directory."""
+    config_file = tmp_path / "config.json"
+    
+    with patch("waze_home.config.CONFIG_DIR", tmp_path), \
+         patch("waze_home.config.CONFIG_FILE", config_file), \
+         patch("waze_home.config._CONFIG_CACHE", None), \
+         patch("waze_home.config._CONFIG_MTIME", None):
+        yield config_file
+
+
 @pytest.fixture
-def mock_config_file():
+def mock_config_file(config_path):
     """Fixture to mock config file operations."""
     config_data = {
         "locations": {
@@ -25,14 +38,13 @@ def mock_config_file():
         "waze_api_key": "test_api_key",
     }
     
-    with patch("builtins.open", mock_open(read_data=json.dumps(config_data))):
-        yield config_data
+    config_path.write_text(json.dumps(config_data))
+    yield config_data
 
 
 def test_get_config_with_existing_file(mock_config_file):
     """Test getting config when the config file exists."""
-    with patch("waze_home.config.CONFIG_FILE.exists", return_value=True):
-        config = get_config()
+    config = get_config()
         
     assert config == mock_config_file
     assert config["locations"]["home"] == "Test Home Address"
@@ -41,9 +53,8 @@ def test_get_config_with_existing_file(mock_config_file):
 
 def test_get_config_with_no_file():
     """Test getting config when the config file does not exist."""
-    with patch("waze_home.config.CONFIG_FILE.exists", return_value=False):
-        with patch.dict(os.environ, {}, clear=True):
-            config = get_config()
+    with patch.dict(os.environ, {}, clear=True):
+        config = get_config()
     
     assert "locations" in config
     assert config["locations"]["home"] == DEFAULT_LOCATIONS["home"]
@@ -56,19 +67,58 @@ def test_get_config_with_env_vars():
     test_work = "Env Work Address"
     test_api_key = "env_api_key"
     
-    with patch("waze_home.config.CONFIG_FILE.exists", return_value=False):
-        with patch.dict(os.environ, {
-            "WAZE_HOME_LOCATION": test_home,
-            "WAZE_WORK_LOCATION": test_work,
-            "WAZE_API_KEY": test_api_key,
-        }):
-            config = get_config()
+    with patch.dict(os.environ, {
+        "WAZE_HOME_LOCATION": test_home,
+        "WAZE_WORK_LOCATION": test_work,
+        "WAZE_API_KEY": test_api_key,
+    }):
+        config = get_config()
     
     assert config["locations"]["home"] == test_home
     assert config["locations"]["work"] == test_work
     assert config["waze_api_key"] == test_api_key
 
 
+def test_get_config_cached_until_modified(mock_config_file, config_path):
+    """Test that the parsed config is reused until the file changes."""
+    first = get_config()
+    
+    with patch.object(type(config_path), "read_bytes") as mock_read:
+        with patch("builtins.open") as mock_file:
+            second = get_config()
+    
+    assert second is first
+    mock_read.assert_not_called()
+    mock_file.assert_not_called()
+    
+    updated = {"locations": {"home": "Moved Home"}}
+    config_path.write_text(json.dumps(updated))
+    os.utime(config_path, ns=(0, 0))
+    
+    assert get_config() == updated
+
+
+def test_save_config_round_trip(config_path):
+    """Test that saved config is written to disk and served from cache."""
+    config = {"locations": {"home": "Saved Home"}}
+    save_config(config)
+    
+    assert json.loads(config_path.read_text()) == config
+    assert get_config() is config
+
+
+def test_save_config_without_orjson(config_path):
+    """Test that the stdlib json fallback reads and writes the same format."""
+    config = {"locations": {"home": "Saved Home"}}
+    
+    with patch("waze_home.config.orjson", None):
+        save_config(config)
+        with patch("waze_home.config._CONFIG_CACHE", None):
+            assert get_config() == config
+    
+    assert json.loads(config_path.read_text()) == config
+
+
 def test_set_location():
     """Test setting a location."""
     with patch("waze_home.config.get_config") as mock_get_config:
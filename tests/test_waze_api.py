@@ -0,0 +1,620 @@
+"""Tests for the waze_api module."""
+
+import io
+import json
+import sys
+import threading
+import time
+from datetime import datetime
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from waze_home import waze_api
+from waze_home.errors import GeocodingError
+from waze_home.models import Route, RouteResponse
+from waze_home.waze_api import get_route
+
+
+HOME = "91 Abbett St, Scarborough WA 6019"
+WORK = "11 Mount St, Perth WA 6000"
+
+
+@pytest.fixture
+def route_cache(tmp_path):
+    """Fixture to point the route cache at a temporary file."""
+    cache_file = tmp_path / "routes.json"
+
+    with patch("waze_home.waze_api.ROUTE_CACHE_FILE", cache_file), \
+         patch("waze_home.waze_api.CACHE_DIR", tmp_path), \
+         patch("waze_home.waze_api._route_cache", None), \
+         patch("waze_home.waze_api._route_cache_dirty", False), \
+         patch("waze_home.waze_api.atexit.register"):
+        yield cache_file
+
+
+@pytest.fixture
+def address_cache(tmp_path):
+    """Fixture to isolate the address cache and its on-disk copy."""
+    cache_file = tmp_path / "geocode.json"
+
+    with patch("waze_home.waze_api.GEOCODE_CACHE_FILE", cache_file), \
+         patch("waze_home.waze_api.CACHE_DIR", tmp_path), \
+         patch("waze_home.waze_api._address_cache_loaded", False), \
+         patch("waze_home.waze_api._address_cache_dirty", False), \
+         patch.dict("waze_home.waze_api.ADDRESS_CACHE"), \
+         patch("waze_home.waze_api._unresolvable_addresses", set()), \
+         patch("waze_home.waze_api.atexit.register"):
+        yield cache_file
+
+
+@pytest.fixture
+def mock_calculator():
+    """Fixture to mock the WazeRouteCalculator backend."""
+    with patch("waze_home.waze_api._calculator_class") as mock_factory:
+        mock_cls = mock_factory.return_value
+        calculator = mock_cls.return_value
+        calculator.calc_route_info.return_value = (25.0, 14.2)
+        calculator.calc_all_routes_info.return_value = {
+            "F-Mitchell Fwy": (25.0, 14.2),
+            "S-West Coast Hwy": (31.0, 15.8),
+        }
+        yield mock_cls
+
+
+def test_get_route_uses_cache(route_cache, mock_calculator):
+    """Test that a repeated route request is served from the cache."""
+    first = get_route(HOME, WORK)
+    second = get_route(HOME, WORK)
+
+    assert mock_calculator.call_count == 1
+    assert second.summary.total_time == "25 minutes"
+    assert second == first
+
+
+def test_get_route_single_routing_call(route_cache, mock_calculator):
+    """Test that the main route is taken from the alternatives request."""
+    route_data = get_route(HOME, WORK)
+
+    calculator = mock_calculator.return_value
+    calculator.calc_route_info.assert_not_called()
+    calculator.calc_all_routes_info.assert_called_once_with(3)
+
+    assert route_data.summary.total_distance == "14.2 km"
+    assert route_data.alternate_routes == [
+        Route(name="Alternative via West Coast Hwy", total_time="31 minutes", total_distance="15.8 km")
+    ]
+
+
+def test_get_route_two_call_fallback(route_cache, mock_calculator):
+    """Test that disabling single-call mode queries the main route separately."""
+    with patch("waze_home.waze_api.SINGLE_ROUTE_CALL", False):
+        get_route(HOME, WORK)
+
+    mock_calculator.return_value.calc_route_info.assert_called_once_with()
+
+
+def test_get_route_direct_api(route_cache, mock_calculator):
+    """Test that the direct client is used when enabled."""
+    routes = {"F-Mitchell Fwy": (25.0, 14.2), "S-West Coast Hwy": (31.0, 15.8)}
+
+    with patch("waze_home.waze_api.DIRECT_API", True), \
+         patch("waze_home.waze_api._get_routes_direct", return_value=routes):
+        route_data = get_route(HOME, WORK)
+
+    mock_calculator.assert_not_called()
+    assert route_data.summary.total_time == "25 minutes"
+
+
+def test_get_route_direct_api_fallback(route_cache, mock_calculator):
+    """Test that a failed direct request falls back to WazeRouteCalculator."""
+    with patch("waze_home.waze_api.DIRECT_API", True), \
+         patch("waze_home.waze_api._get_routes_direct", return_value=None):
+        route_data = get_route(HOME, WORK)
+
+    mock_calculator.assert_called_once()
+    assert route_data.summary.total_distance == "14.2 km"
+
+
+def test_get_routes_direct_malformed_response():
+    """Test that a malformed direct response falls back to WazeRouteCalculator."""
+    pytest.importorskip("httpx")
+    from waze_home._waze_direct import WazeDirectError
+
+    with patch("waze_home._waze_direct.get_all_routes", side_effect=WazeDirectError("bad shape")):
+        assert waze_api._get_routes_direct(HOME, WORK) is None
+
+
+def test_get_route_no_cache_refetches(route_cache, mock_calculator):
+    """Test that use_cache=False always queries the backend."""
+    get_route(HOME, WORK)
+    get_route(HOME, WORK, use_cache=False)
+
+    assert mock_calculator.call_count == 2
+
+
+def test_get_route_expired_entry(route_cache, mock_calculator):
+    """Test that cached routes older than the TTL are refetched."""
+    get_route(HOME, WORK)
+
+    with patch("waze_home.waze_api.time.time", return_value=time.time() + 121):
+        get_route(HOME, WORK, ttl=120)
+
+    assert mock_calculator.call_count == 2
+
+
+@pytest.mark.parametrize("value, expected", [(None, 120), ("300", 300), ("2m", 120), ("", 120)])
+def test_cache_ttl_from_environment(monkeypatch, value, expected):
+    """Test that WAZE_HOME_CACHE_TTL is parsed, falling back to the default if invalid."""
+    if value is None:
+        monkeypatch.delenv("WAZE_HOME_CACHE_TTL", raising=False)
+    else:
+        monkeypatch.setenv("WAZE_HOME_CACHE_TTL", value)
+
+    assert waze_api._cache_ttl() == expected
+
+
+def test_route_cache_persisted(route_cache, mock_calculator):
+    """Test that the route cache is written to and read back from disk."""
+    get_route(HOME, WORK)
+    waze_api._save_route_cache()
+
+    saved = json.loads(route_cache.read_text())
+    assert f"{HOME} -> {WORK}" in saved
+
+    with patch("waze_home.waze_api._route_cache", None):
+        get_route(HOME, WORK)
+
+    assert mock_calculator.call_count == 1
+
+
+def test_route_cache_not_an_object(route_cache, mock_calculator):
+    """Test that a route cache file holding the wrong JSON type is ignored."""
+    route_cache.write_text("[]")
+
+    route_data = get_route(HOME, WORK)
+
+    assert route_data.summary.total_time == "25 minutes"
+    assert mock_calculator.call_count == 1
+
+
+@pytest.mark.parametrize("entry", [
+    # Fresh (timestamped in 2100) but missing the summary fields
+    {"timestamp": 4102444800, "travel_time": 1500, "route": {"summary": {}}},
+    {"travel_time": 1500, "route": {}},
+    {"timestamp": "now", "travel_time": 1500, "route": {}},
+    ["not", "an", "entry"],
+])
+def test_route_cache_corrupt_entry(route_cache, mock_calculator, entry):
+    """Test that an undecodable cache entry is dropped and refetched."""
+    route_cache.write_text(json.dumps({f"{HOME} -> {WORK}": entry}))
+
+    route_data = get_route(HOME, WORK)
+
+    assert route_data.summary.total_time == "25 minutes"
+    assert mock_calculator.call_count == 1
+    assert get_route(HOME, WORK) is not None
+    assert mock_calculator.call_count == 1
+
+
+def test_cached_route_times_refreshed(route_cache, mock_calculator):
+    """Test that cache hits report departure from now, not from the fetch."""
+    get_route(HOME, WORK)
+
+    with patch("waze_home.waze_api._trip_times", return_value=("08:00", "08:25")) as mock_times:
+        cached = get_route(HOME, WORK)
+
+    mock_times.assert_called_once_with(25 * 60)
+    assert cached.summary.departure_time == "08:00"
+    assert cached.summary.arrival_time == "08:25"
+
+
+def test_build_render_model_alternates():
+    """Test that every route after the first is listed as an alternative."""
+    all_routes = {
+        "F-Mitchell Fwy": (25.0, 14.2),
+        "S-West Coast Hwy": (31.0, 15.8),
+        "Unnamed": (40.0, 13.0),
+    }
+
+    route_data = waze_api.build_render_model(25.0, 14.2, all_routes, HOME, WORK)
+
+    assert [alt.name for alt in route_data.alternate_routes] == [
+        "Alternative via West Coast Hwy",
+        "Alternative via Alternative route 2",
+    ]
+    assert waze_api.build_render_model(25.0, 14.2, {"F-Mitchell Fwy": (25.0, 14.2)}, HOME, WORK).alternate_routes == []
+
+
+@pytest.mark.parametrize("distance, expected", [
+    (14.0, "Heavy traffic"),
+    (15.0, "Moderate traffic"),
+    (25.0, "Light traffic with some congestion"),
+    (35.0, "Light traffic"),
+])
+def test_estimate_traffic_condition(distance, expected):
+    """Test traffic estimates at and around the speed thresholds."""
+    assert waze_api._estimate_traffic_condition(30.0, distance) == expected
+
+
+def test_format_helpers():
+    """Test display formatting of durations and distances."""
+    assert waze_api._format_duration(25 * 60) == "25 minutes"
+    assert waze_api._format_duration(25 * 60 - 1) == "24 minutes"
+    assert waze_api._format_distance(14200) == "14.2 km"
+    assert waze_api._format_distance(800) == "0.8 km"
+
+
+def test_format_route_info_shim():
+    """Test that format_route_info converts render-ready data to a dict."""
+    route_data = waze_api._get_mock_route_data(HOME, WORK)
+    formatted = waze_api.format_route_info(route_data)
+
+    assert formatted["summary"]["total_time"] == route_data.summary.total_time
+    assert formatted["alternate_routes"][0]["name"] == "Alternative via Mitchell Freeway"
+    assert waze_api.format_route_info(formatted) is formatted
+    assert waze_api.format_route_info({})["status"] == "error"
+
+
+def test_route_response_dict_round_trip():
+    """Test that cached dicts rebuild the same route response."""
+    route_data = waze_api._get_mock_route_data(HOME, WORK)
+
+    assert RouteResponse.from_dict(route_data.to_dict()) == route_data
+
+
+def test_mock_fallback_not_cached(route_cache, mock_calculator):
+    """Test that fallback mock data is not stored in the cache."""
+    mock_calculator.side_effect = ConnectionError("network down")
+
+    route_data = get_route(HOME, WORK)
+
+    assert route_data.traffic_conditions == "Light to moderate traffic"
+    assert waze_api._load_route_cache() == {}
+
+
+def test_use_mock_skips_backend(route_cache, mock_calculator):
+    """Test that mock mode never queries the backend or the cache."""
+    with patch("waze_home.waze_api.USE_MOCK", True):
+        route_data = get_route(HOME, WORK)
+
+    mock_calculator.assert_not_called()
+    assert route_data.traffic_conditions == "Light to moderate traffic"
+    assert waze_api._route_cache is None
+
+
+def test_unexpected_errors_not_masked(route_cache, mock_calculator):
+    """Test that programming errors propagate instead of returning mock data."""
+    mock_calculator.side_effect = TypeError("bad call")
+
+    with pytest.raises(TypeError):
+        get_route(HOME, WORK)
+
+
+@pytest.mark.parametrize("geocode_body, routing_body", [
+    ({"error": "rate limited"}, {"response": {}}),
+    ([{"city": "Perth", "location": {"lat": -31.9, "lon": 115.8}, "bounds": None}], {"response": None}),
+])
+def test_library_malformed_response_falls_back(route_cache, address_cache, geocode_body, routing_body):
+    """Test that malformed replies on the WazeRouteCalculator path give mock data."""
+    pytest.importorskip("WazeRouteCalculator")
+    calculator_class = waze_api._calculator_class()
+    library_module = sys.modules[calculator_class.__bases__[0].__module__]
+
+    def fake_get(url, **kwargs):
+        response = MagicMock(ok=True)
+        response.json.return_value = geocode_body if url.endswith("/mozi") else routing_body
+        return response
+
+    with patch.object(library_module, "requests") as mock_requests:
+        mock_requests.get.side_effect = fake_get
+        route_data = get_route("1 First St, Perth", "2 Second St, Perth")
+
+    assert route_data.traffic_conditions == "Light to moderate traffic"
+    assert not waze_api._unresolvable_addresses
+
+
+def test_known_addresses_skip_geocoding(address_cache):
+    """Test that cached addresses never reach the library's geocoder."""
+    pytest.importorskip("WazeRouteCalculator")
+    calculator_class = waze_api._calculator_class()
+
+    base_class = calculator_class.__bases__[0]
+
+    with patch.object(base_class, "address_to_coords") as mock_geocode:
+        calculator = calculator_class(HOME, WORK, region="AU")
+
+    mock_geocode.assert_not_called()
+    assert calculator.start_coords["lat"] == waze_api._lookup_address(HOME)[0]
+    assert calculator.end_coords["lon"] == waze_api._lookup_address(WORK)[1]
+
+
+def test_new_addresses_persisted(address_cache):
+    """Test that newly geocoded addresses are cached and saved to disk."""
+    pytest.importorskip("WazeRouteCalculator")
+    calculator_class = waze_api._calculator_class()
+    base_class = calculator_class.__bases__[0]
+    gym = "1 Test St, Perth WA 6000"
+
+    with patch.object(
+        base_class,
+        "address_to_coords",
+        return_value={"lat": -31.95, "lon": 115.86, "bounds": {}},
+    ) as mock_geocode:
+        calculator_class(HOME, gym, region="AU")
+        calculator_class(gym, HOME, region="AU")
+
+    mock_geocode.assert_called_once_with(gym)
+    assert waze_api._lookup_address(gym) == (-31.95, 115.86)
+
+    waze_api._save_address_cache()
+    assert json.loads(address_cache.read_text())[gym.lower()] == [-31.95, 115.86]
+
+
+def test_geocode_cache_not_an_object(address_cache):
+    """Test that a geocode cache file holding the wrong JSON type is ignored."""
+    address_cache.write_text("[]")
+
+    assert waze_api._lookup_address(HOME) == (-31.8941, 115.7586)
+
+
+def test_geocode_cache_bad_entries_skipped(address_cache):
+    """Test that geocode cache entries that aren't coordinate pairs are skipped."""
+    address_cache.write_text(json.dumps({
+        "x": 5,
+        "y": [1],
+        "z": ["a", "b"],
+        "1 Good St": [-31.95, 115.86],
+    }))
+
+    assert waze_api._lookup_address("1 Good St") == (-31.95, 115.86)
+    assert waze_api._lookup_address("x") is None
+    assert waze_api._lookup_address("z") is None
+
+
+def test_address_lookup_normalized(address_cache):
+    """Test that address lookups ignore case and extra whitespace."""
+    assert waze_api._lookup_address(f"  {HOME.upper()} ") == waze_api._lookup_address(HOME)
+    assert waze_api._lookup_address(HOME.replace(" ", "  ")) == waze_api._lookup_address(HOME)
+    assert waze_api._lookup_address(HOME) is not None
+
+
+def test_unresolvable_address_not_retried(address_cache):
+    """Test that an address the geocoder rejected fails fast on the next try."""
+    WazeRouteCalculator = pytest.importorskip("WazeRouteCalculator")
+    calculator_class = waze_api._calculator_class()
+    base_class = calculator_class.__bases__[0]
+
+    with patch.object(
+        base_class,
+        "address_to_coords",
+        side_effect=WazeRouteCalculator.WRCError("Cannot get coords for Nowhere"),
+    ) as mock_geocode:
+        with pytest.raises(WazeRouteCalculator.WRCError):
+            calculator_class("Nowhere", WORK, region="AU")
+        with pytest.raises(GeocodingError):
+            calculator_class("Nowhere", WORK, region="AU")
+
+    mock_geocode.assert_called_once_with("Nowhere")
+
+
+def test_library_uses_shared_session():
+    """Test that library HTTP calls go through one keep-alive session."""
+    pytest.importorskip("WazeRouteCalculator")
+    calculator_class = waze_api._calculator_class()
+    library_module = sys.modules[calculator_class.__bases__[0].__module__]
+    session = waze_api._get_session()
+
+    assert library_module.requests is session
+    assert waze_api._get_session() is session
+    adapter = session.get_adapter("https://www.waze.com/")
+    assert adapter._pool_maxsize == 16
+    assert adapter.max_retries.total == 3
+
+
+def test_session_default_timeout():
+    """Test that session requests get a timeout unless they set one."""
+    requests = pytest.importorskip("requests")
+    adapter = waze_api._get_session().get_adapter("https://www.waze.com/")
+    request = requests.Request("GET", "https://www.waze.com/").prepare()
+
+    with patch("requests.adapters.HTTPAdapter.send") as mock_send:
+        adapter.send(request)
+        adapter.send(request, timeout=30)
+
+    assert mock_send.call_args_list[0].kwargs["timeout"] == waze_api.REQUEST_TIMEOUT
+    assert mock_send.call_args_list[1].kwargs["timeout"] == 30
+
+
+def test_session_parses_json_bytes():
+    """Test that session responses decode JSON bodies with config.loads."""
+    requests = pytest.importorskip("requests")
+    urllib3 = pytest.importorskip("urllib3")
+    adapter = waze_api._get_session().get_adapter("https://www.waze.com/")
+    request = requests.Request("GET", "https://www.waze.com/").prepare()
+
+    def build(body):
+        raw = urllib3.HTTPResponse(body=io.BytesIO(body), status=200, preload_content=False)
+        return adapter.build_response(request, raw)
+
+    with patch("waze_home.waze_api.loads", wraps=waze_api.loads) as mock_loads:
+        assert build(b'[{"city": "Perth"}]').json() == [{"city": "Perth"}]
+
+    mock_loads.assert_called_once_with(b'[{"city": "Perth"}]')
+    with pytest.raises(requests.JSONDecodeError):
+        build(b"<html>").json()
+
+    with patch("waze_home.config.orjson", None):
+        assert build(b'[{"city": "Perth"}]').json() == [{"city": "Perth"}]
+        with pytest.raises(requests.JSONDecodeError):
+            build(b"<html>").json()
+
+
+def test_generate_directions():
+    """Test predefined directions for known routes and the generic fallback."""
+    to_work = waze_api._generate_directions(HOME, WORK)
+    to_home = waze_api._generate_directions(WORK, HOME)
+    unknown = waze_api._generate_directions(HOME, "Somewhere else")
+
+    assert to_work[0] == "Head south on Abbett St toward Brighton Rd"
+    assert to_home[-1] == "Arrive at destination on right"
+    assert unknown[0] == "Start driving"
+
+    # Callers get their own copy of the shared directions
+    to_work.append("Extra step")
+    assert len(waze_api._generate_directions(HOME, WORK)) == 6
+
+
+def test_trip_times():
+    """Test that departure and arrival come from one clock reading."""
+    now = datetime(2024, 5, 1, 23, 50, 59).timestamp()
+
+    with patch("waze_home.waze_api.time.time", return_value=now) as mock_time:
+        departure, arrival = waze_api._trip_times(25 * 60)
+
+    mock_time.assert_called_once_with()
+    assert (departure, arrival) == ("23:50", "00:15")
+
+
+def test_now_hhmm_cached_within_minute():
+    """Test that the formatted time is only rebuilt when the minute changes."""
+    now = datetime(2024, 5, 1, 8, 30, 0).timestamp()
+
+    with patch("waze_home.waze_api._now_cache", (-1, "")), \
+         patch("waze_home.waze_api.time.localtime", wraps=time.localtime) as mock_localtime:
+        with patch("waze_home.waze_api.time.time", return_value=now):
+            assert waze_api._now_hhmm() == (now, "08:30")
+        with patch("waze_home.waze_api.time.time", return_value=now + 59):
+            assert waze_api._now_hhmm() == (now + 59, "08:30")
+        assert mock_localtime.call_count == 1
+
+        with patch("waze_home.waze_api.time.time", return_value=now + 60):
+            assert waze_api._now_hhmm() == (now + 60, "08:31")
+
+
+def test_unknown_endpoints_geocoded_concurrently(address_cache):
+    """Test that two uncached endpoints are geocoded on worker threads, once each."""
+    pytest.importorskip("WazeRouteCalculator")
+    calculator_class = waze_api._calculator_class()
+    base_class = calculator_class.__bases__[0]
+    threads = {}
+
+    def geocode(address):
+        threads[address] = threading.current_thread()
+        return {"lat": -31.9, "lon": 115.8, "bounds": {}}
+
+    with patch.object(base_class, "address_to_coords", side_effect=geocode) as mock_geocode:
+        calculator_class("1 First St, Perth", "2 Second St, Perth", region="AU")
+
+    assert mock_geocode.call_count == 2
+    assert all(thread.name == "waze-geocode" and thread.daemon for thread in threads.values())
+
+
+def test_prefetched_route_reused(route_cache, mock_calculator):
+    """Test that get_route waits for a matching prefetch instead of refetching."""
+    with patch.dict("waze_home.waze_api._prefetched", clear=True):
+        future = waze_api.prefetch_route(HOME, WORK, use_cache=False)
+        route_data = get_route(HOME, WORK, use_cache=False)
+
+    assert route_data is future.result()
+    assert mock_calculator.call_count == 1
+
+
+def test_prefetch_runs_on_daemon_thread(route_cache, mock_calculator):
+    """Test that prefetches don't hold up interpreter exit."""
+    threads = []
+
+    def calculator(*args, **kwargs):
+        threads.append(threading.current_thread())
+        return mock_calculator.return_value
+
+    mock_calculator.side_effect = calculator
+
+    with patch.dict("waze_home.waze_api._prefetched", clear=True):
+        waze_api.prefetch_route(HOME, WORK, use_cache=False).result()
+
+    assert threads[0].name == "waze-prefetch"
+    assert threads[0].daemon
+
+
+def test_run_in_background_propagates_errors():
+    """Test that exceptions on the background thread reach the caller."""
+    future = waze_api._run_in_background("test", int, "not a number")
+
+    with pytest.raises(ValueError):
+        future.result()
+
+
+def test_stale_prefetch_ignored(route_cache, mock_calculator):
+    """Test that a prefetch older than the prefetch TTL is not served."""
+    with patch.dict("waze_home.waze_api._prefetched", clear=True):
+        waze_api.prefetch_route(HOME, WORK, use_cache=False).result()
+
+        with patch("waze_home.waze_api.time.time", return_value=time.time() + 31):
+            get_route(HOME, WORK, use_cache=False)
+
+    assert mock_calculator.call_count == 2
+
+
+def test_mock_route_data():
+    """Test mock routes for known addresses and the generic fallback."""
+    to_work = waze_api._get_mock_route_data(HOME, WORK)
+    unknown = waze_api._get_mock_route_data(HOME, "Somewhere else")
+
+    assert to_work.summary.total_distance == "14.2 km"
+    assert to_work.directions == waze_api._generate_directions(HOME, WORK)
+    assert unknown.summary.total_distance == "12.0 km"
+    assert unknown.directions[0] == "Start driving"
+    assert to_work.alternate_routes[0].total_time == "74 minutes"
+
+
+def test_mock_route_data_fresh_times():
+    """Test that repeated mock routes share formatting but not the clock."""
+    with patch("waze_home.waze_api._trip_times", return_value=("08:00", "09:09")):
+        first = waze_api._get_mock_route_data(HOME, WORK)
+    with patch("waze_home.waze_api._trip_times", return_value=("08:01", "09:10")):
+        second = waze_api._get_mock_route_data(HOME, WORK)
+
+    assert first.summary.departure_time == "08:00"
+    assert second.summary.departure_time == "08:01"
+    assert first.alternate_routes == second.alternate_routes
+    assert first.directions is not second.directions
+
+
+def test_mock_alternate_routes_immutable():
+    """Test that shared mock alternate routes can't be changed through one response."""
+    route_data = waze_api._get_mock_route_data(HOME, WORK)
+
+    with pytest.raises(AttributeError):
+        route_data.alternate_routes[0].total_time = "X"
+
+    assert waze_api._get_mock_route_data(HOME, WORK).alternate_routes[0].total_time == "74 minutes"
+
+
+def test_get_coordinates_batch(address_cache):
+    """Test that a batch geocodes each distinct unknown address once."""
+    gym = "1 Test St, Perth WA 6000"
+    shop = "2 Test St, Perth WA 6000"
+    geocoded = {gym: {"lat": -31.95, "lon": 115.86}, shop: {"lat": -31.96, "lon": 115.87}}
+
+    def geocode(address):
+        waze_api._remember_address(address, (geocoded[address]["lat"], geocoded[address]["lon"]))
+        return geocoded[address]
+
+    coords = waze_api._get_coordinates_batch([gym, HOME, shop, gym.upper()], geocode)
+
+    assert coords == [(-31.95, 115.86), waze_api._lookup_address(HOME), (-31.96, 115.87), (-31.95, 115.86)]
+    assert waze_api._get_coordinates_batch([shop], lambda address: pytest.fail("geocoded twice")) == [(-31.96, 115.87)]
+
+
+def test_get_coordinates_batch_threads_only_when_parallel(address_cache):
+    """Test that threads are only started when several addresses need geocoding."""
+    gym = "1 Test St, Perth WA 6000"
+
+    with patch("waze_home.waze_api._run_in_background") as run_in_background:
+        assert waze_api._get_coordinates_batch([HOME, HOME.lower()], lambda address: pytest.fail("geocoded")) == [
+            waze_api._lookup_address(HOME),
+        ] * 2
+        waze_api._get_coordinates_batch([HOME, gym], lambda address: {"lat": -31.95, "lon": 115.86})
+
+    run_in_background.assert_not_called()
@@ -0,0 +1,194 @@
+"""Tests for the direct Waze client."""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from unittest.mock import patch
+
+httpx = pytest.importorskip("httpx")
+
+from waze_home import _waze_direct
+from waze_home._waze_direct import WazeDirectError, get_all_routes
+from waze_home.errors import GeocodingError
+
+
+HOME = "91 Abbett St, Scarborough WA 6019"
+WORK = "11 Mount St, Perth WA 6000"
+
+GEOCODE_RESULTS = {
+    HOME: [{"city": "Scarborough", "location": {"lat": -31.8941, "lon": 115.7586}}],
+    WORK: [{"city": "Perth", "location": {"lat": -31.9523, "lon": 115.8613}}],
+}
+
+ROUTING_RESPONSE = {
+    "alternatives": [
+        {
+            "response": {
+                "routeType": ["FASTEST"],
+                "shortRouteName": "Mitchell Fwy",
+                "results": [
+                    {"crossTime": 900, "length": 9000},
+                    {"crossTime": 600, "length": 5200},
+                ],
+            }
+        },
+        {
+            "response": {
+                "routeType": ["SHORTEST"],
+                "shortRouteName": "West Coast Hwy",
+                "results": [{"crossTime": 1860, "length": 15800}],
+            }
+        },
+    ]
+}
+
+
+@pytest.fixture
+def waze_server():
+    """Fixture to serve canned geocoding and routing responses."""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if request.url.path.endswith("/mozi"):
+            return httpx.Response(200, json=GEOCODE_RESULTS.get(request.url.params["q"], []))
+        return httpx.Response(200, json=ROUTING_RESPONSE)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    with patch("waze_home._waze_direct._client", client):
+        yield requests
+
+
+def test_get_all_routes(waze_server):
+    """Test that routes are totalled in WazeRouteCalculator's format."""
+    routes = get_all_routes(HOME, WORK)
+
+    assert list(routes) == ["FASTEST-Mitchell Fwy", "SHORTEST-West Coast Hwy"]
+    assert routes["FASTEST-Mitchell Fwy"] == (25.0, 14.2)
+
+    routing_request = waze_server[-1]
+    assert routing_request.url.params["from"] == "x:115.7586 y:-31.8941"
+    assert routing_request.url.params["nPaths"] == "3"
+    assert routing_request.url.params["options"] == "AVOID_TRAILS:t,AVOID_TOLL_ROADS:f,AVOID_FERRIES:f"
+
+
+def test_get_all_routes_uses_known_coords(waze_server):
+    """Test that known coordinates skip the geocoding requests."""
+    known = {HOME: (-31.8941, 115.7586), WORK: (-31.9523, 115.8613)}
+
+    get_all_routes(HOME, WORK, lookup_coords=known.get)
+
+    assert len(waze_server) == 1
+
+
+def test_get_all_routes_remembers_coords(waze_server):
+    """Test that geocoded coordinates are handed back to the caller."""
+    remembered = {}
+
+    get_all_routes(HOME, WORK, remember_coords=remembered.__setitem__)
+
+    assert remembered == {HOME: (-31.8941, 115.7586), WORK: (-31.9523, 115.8613)}
+
+
+def test_geocode_query_encoded(waze_server):
+    """Test that reserved URL characters in an address survive the query string."""
+    address = "Unit 2 & 3, #4 Hay St?"
+    known = {WORK: (-31.9523, 115.8613)}
+
+    with pytest.raises(GeocodingError):
+        get_all_routes(address, WORK, lookup_coords=known.get)
+
+    assert waze_server[0].url.params["q"] == address
+
+
+def test_unknown_address(waze_server):
+    """Test that an address without geocoding results raises."""
+    with pytest.raises(GeocodingError) as exc_info:
+        get_all_routes("Nowhere", WORK)
+
+    assert exc_info.value.address == "Nowhere"
+
+
+def test_routing_error():
+    """Test that an error from the routing server raises."""
+    def handler(request):
+        if request.url.path.endswith("/mozi"):
+            return httpx.Response(200, content=json.dumps(GEOCODE_RESULTS[WORK]))
+        return httpx.Response(200, json={"error": "No route"})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    with patch("waze_home._waze_direct._client", client):
+        with pytest.raises(WazeDirectError, match="No route"):
+            get_all_routes(WORK, WORK)
+
+
+GEOMETRY = [
+    {"x": 115.7586, "y": -31.8941},
+    {"x": 115.8000, "y": -31.9200},
+    {"x": 115.8613, "y": -31.9523},
+]
+
+
+def test_route_length_from_geometry():
+    """Test that a route without segment lengths is measured from its geometry."""
+    route = {
+        "routeType": ["FASTEST"],
+        "results": [{"crossTime": 900}, {"crossTime": 600}],
+        "coords": GEOMETRY,
+    }
+
+    minutes, kilometers = _waze_direct._add_up_route(route)
+
+    assert minutes == 25.0
+    assert kilometers == pytest.approx(11.66, abs=0.01)
+
+
+def test_geometry_length_numpy_matches_python():
+    """Test that the vectorized haversine agrees with the plain Python one."""
+    pytest.importorskip("numpy")
+
+    with patch.dict("sys.modules", {"numpy": None}):
+        expected = _waze_direct._geometry_length(GEOMETRY)
+
+    assert _waze_direct._geometry_length(GEOMETRY) == pytest.approx(expected)
+
+
+def test_http_error():
+    """Test that HTTP failures are reported as WazeDirectError."""
+    client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(503)))
+
+    with patch("waze_home._waze_direct._client", client):
+        with pytest.raises(WazeDirectError):
+            get_all_routes(HOME, WORK)
+
+
+def test_get_all_routes_from_threads(waze_server):
+    """Test that concurrent callers share the client's event loop safely."""
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = list(pool.map(lambda _: get_all_routes(HOME, WORK), range(4)))
+
+    assert all(routes["FASTEST-Mitchell Fwy"] == (25.0, 14.2) for routes in results)
+
+
+@pytest.mark.parametrize("geocode_body, routing_body", [
+    ({"error": "rate limited"}, ROUTING_RESPONSE),
+    (GEOCODE_RESULTS[WORK], {"response": None}),
+    (GEOCODE_RESULTS[WORK], []),
+    (GEOCODE_RESULTS[WORK], {"alternatives": [{"response": {"results": "oops"}}]}),
+    (GEOCODE_RESULTS[WORK], {"response": {"results": [{"crossTime": None, "length": 100}]}}),
+    (GEOCODE_RESULTS[WORK], {"response": {"results": [{"crossTime": 60}], "coords": None}}),
+    (GEOCODE_RESULTS[WORK], {"response": {"results": [{"crossTime": 60}], "coords": [1, 2]}}),
+    (GEOCODE_RESULTS[WORK], {"response": {"results": [{"crossTime": 60}], "coords": [{"x": "a", "y": 1}] * 2}}),
+])
+def test_malformed_response(geocode_body, routing_body):
+    """Test that responses of the wrong shape raise WazeDirectError."""
+    def handler(request):
+        if request.url.path.endswith("/mozi"):
+            return httpx.Response(200, json=geocode_body)
+        return httpx.Response(200, json=routing_body)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    with patch("waze_home._waze_direct._client", client):
+        with pytest.raises(WazeDirectError):
+            get_all_routes(WORK, WORK)
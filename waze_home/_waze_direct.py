@@ -0,0 +1,346 @@
+"""Direct access to the Waze geocoding and routing JSON endpoints.
+
+This is an opt-in fast path (WAZE_HOME_DIRECT=1) for waze_api.get_route that
+talks to the same endpoints as WazeRouteCalculator, but geocodes both ends
+concurrently over one shared httpx.AsyncClient and parses responses with
+orjson when it is installed.
+"""
+
+import asyncio
+import atexit
+import importlib.util
+import math
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from .config import loads
+from .errors import GeocodingError
+
+WAZE_URL = "https://www.waze.com/"
+HEADERS = {
+    "User-Agent": "Mozilla/5.0",
+    "referer": WAZE_URL,
+}
+
+# Endpoints and search origins per region, as used by WazeRouteCalculator
+BASE_COORDS = {
+    "US": {"lat": 40.713, "lon": -74.006},
+    "EU": {"lat": 47.498, "lon": 19.040},
+    "IL": {"lat": 31.768, "lon": 35.214},
+    "AU": {"lat": -35.281, "lon": 149.128},
+}
+COORD_SERVERS = {
+    "US": "SearchServer/mozi",
+    "EU": "row-SearchServer/mozi",
+    "IL": "il-SearchServer/mozi",
+    "AU": "row-SearchServer/mozi",
+}
+ROUTING_SERVERS = {
+    "US": "https://routing-livemap-am.waze.com/RoutingManager/routingRequest",
+    "EU": "https://routing-livemap-row.waze.com/RoutingManager/routingRequest",
+    "IL": "https://routing-livemap-il.waze.com/RoutingManager/routingRequest",
+    "AU": "https://routing-livemap-row.waze.com/RoutingManager/routingRequest",
+}
+
+# Routing query parameters that are the same for every request. `at` is the
+# departure offset in minutes, so 0 means leaving now.
+_BASE_PARAMS: Dict[str, Any] = {
+    "at": 0,
+    "returnJSON": "true",
+    "returnGeometries": "true",
+    "returnInstructions": "true",
+    "timeout": 60000,
+    "options": "AVOID_TRAILS:t,AVOID_TOLL_ROADS:f,AVOID_FERRIES:f",
+    "subscription": "*",
+}
+
+Coords = Tuple[float, float]
+
+# Mean Earth radius in meters, for great-circle distances
+EARTH_RADIUS_M = 6371000.0
+
+# Client and event loop shared by all requests in this process. The client's
+# connections belong to the loop it was first used on, so both live together.
+_client: Optional[httpx.AsyncClient] = None
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# The loop can only run one request at a time, but get_all_routes may be
+# called from several threads (e.g. background prefetches)
+_loop_lock = threading.Lock()
+
+class WazeDirectError(Exception):
+    """Raised when a Waze endpoint returns an unusable response."""
+
+def get_all_routes(
+    origin: str,
+    destination: str,
+    region: str = "AU",
+    npaths: int = 3,
+    lookup_coords: Optional[Callable[[str], Optional[Coords]]] = None,
+    remember_coords: Optional[Callable[[str, Coords], None]] = None,
+) -> Dict[str, Tuple[float, float]]:
+    """
+    Get all routes between two addresses.
+    
+    Args:
+        origin: Starting address
+        destination: Ending address
+        region: Waze region (EU, US, IL, or AU)
+        npaths: Maximum number of routes to request
+        lookup_coords: Optional callback returning cached (lat, lon) for an address
+        remember_coords: Optional callback storing newly geocoded coordinates
+    
+    Returns:
+        Dictionary mapping route names to (minutes, kilometers), in the same
+        format as WazeRouteCalculator.calc_all_routes_info
+    
+    Raises:
+        GeocodingError: If an address cannot be resolved
+        WazeDirectError: If a request fails or returns an unusable response
+    """
+    try:
+        with _loop_lock:
+            return _get_loop().run_until_complete(
+                fetch_all_routes(origin, destination, region, npaths, lookup_coords, remember_coords)
+            )
+    except httpx.HTTPError as e:
+        raise WazeDirectError(str(e)) from e
+
+async def fetch_all_routes(
+    origin: str,
+    destination: str,
+    region: str = "AU",
+    npaths: int = 3,
+    lookup_coords: Optional[Callable[[str], Optional[Coords]]] = None,
+    remember_coords: Optional[Callable[[str, Coords], None]] = None,
+) -> Dict[str, Tuple[float, float]]:
+    """
+    Asynchronously get all routes between two addresses.
+    
+    See get_all_routes for the arguments and return value.
+    """
+    client = _get_client()
+    
+    async def resolve(address: str) -> Coords:
+        coords = lookup_coords(address) if lookup_coords else None
+        if coords is None:
+            coords = await _geocode(client, address, region)
+            if remember_coords:
+                remember_coords(address, coords)
+        return coords
+    
+    # Both ends are independent, so geocode them concurrently
+    (start_lat, start_lon), (end_lat, end_lon) = await asyncio.gather(
+        resolve(origin), resolve(destination)
+    )
+    
+    params = {
+        **_BASE_PARAMS,
+        "from": f"x:{start_lon} y:{start_lat}",
+        "to": f"x:{end_lon} y:{end_lat}",
+        "nPaths": npaths,
+    }
+    response = await client.get(ROUTING_SERVERS[region], params=params)
+    response.raise_for_status()
+    data = loads(response.content)
+    
+    if not isinstance(data, dict):
+        raise WazeDirectError("Unexpected routing response: not a JSON object")
+    
+    if "error" in data:
+        raise WazeDirectError(str(data["error"]))
+    
+    alternatives = data.get("alternatives")
+    if alternatives:
+        if not isinstance(alternatives, list) or not all(isinstance(alt, dict) for alt in alternatives):
+            raise WazeDirectError("Unexpected routing response: malformed alternatives")
+        routes = [alt.get("response") for alt in alternatives]
+    else:
+        response_obj = data.get("response")
+        routes = response_obj if isinstance(response_obj, list) else [response_obj]
+    
+    if not routes or not all(isinstance(route, dict) for route in routes):
+        raise WazeDirectError("Unexpected routing response: no usable routes")
+    
+    try:
+        return {_route_name(route): _add_up_route(route) for route in routes}
+    except KeyError as e:
+        raise WazeDirectError(f"Unexpected routing response: missing {e}") from e
+
+async def _geocode(client: httpx.AsyncClient, address: str, region: str) -> Coords:
+    """
+    Geocode an address with the Waze search server.
+    
+    Args:
+        client: HTTP client to use
+        address: Address to geocode
+        region: Waze region (EU, US, IL, or AU)
+    
+    Returns:
+        (lat, lon) tuple
+    """
+    base_coords = BASE_COORDS[region]
+    params = {
+        "q": address,
+        "lang": "eng",
+        "origin": "livemap",
+        "lat": base_coords["lat"],
+        "lon": base_coords["lon"],
+    }
+    response = await client.get(WAZE_URL + COORD_SERVERS[region], params=params)
+    response.raise_for_status()
+    
+    results = loads(response.content)
+    if not isinstance(results, list):
+        raise WazeDirectError(f"Unexpected geocoding response for {address}: {results!r:.100}")
+    
+    for result in results:
+        if isinstance(result, dict) and result.get("city"):
+            location = result.get("location")
+            if not isinstance(location, dict):
+                raise WazeDirectError(f"Unexpected geocoding response for {address}: missing location")
+            return location["lat"], location["lon"]
+    
+    raise GeocodingError(address)
+
+def _route_name(route: Dict[str, Any]) -> str:
+    """Build a route name the same way as WazeRouteCalculator."""
+    route_type = "".join(route.get("routeType", [])[:1])
+    return f"{route_type}-{route.get('shortRouteName', 'unkown')}"
+
+def _add_up_route(route: Dict[str, Any]) -> Tuple[float, float]:
+    """
+    Total up the segments of a route.
+    
+    Args:
+        route: Single route from the routing response
+    
+    Returns:
+        (minutes, kilometers) tuple
+    """
+    segments: List[Dict[str, Any]] = route["results" if "results" in route else "result"]
+    if not isinstance(segments, list) or not all(isinstance(segment, dict) for segment in segments):
+        raise WazeDirectError("Unexpected routing response: malformed route segments")
+    
+    seconds = 0
+    meters = 0
+    has_lengths = True
+    for segment in segments:
+        seconds += _number(segment["crossTime"] if "crossTime" in segment else segment["cross_time"], "crossTime")
+        if "length" in segment:
+            meters += _number(segment["length"], "length")
+        else:
+            has_lengths = False
+    
+    if not has_lengths:
+        # Some segments came without a length; measure the route geometry instead
+        coords = route["coords"]
+        if not isinstance(coords, list) or not all(isinstance(point, dict) for point in coords):
+            raise WazeDirectError("Unexpected routing response: malformed route geometry")
+        meters = _geometry_length(coords)
+    
+    return seconds / 60.0, meters / 1000.0
+
+def _geometry_length(coords: List[Dict[str, float]]) -> float:
+    """
+    Measure a route geometry as the sum of its great-circle segment lengths.
+    
+    Args:
+        coords: Route points as returned with returnGeometries, each with
+            "x" (longitude) and "y" (latitude)
+    
+    Returns:
+        Length in meters
+    """
+    if len(coords) < 2:
+        return 0.0
+    
+    lats = [_number(point["y"], "y") for point in coords]
+    lons = [_number(point["x"], "x") for point in coords]
+    
+    try:
+        import numpy as np
+    except ImportError:  # numpy is an optional speedup
+        return sum(
+            _haversine(lats[i], lons[i], lats[i + 1], lons[i + 1])
+            for i in range(len(coords) - 1)
+        )
+    
+    lat = np.asarray(lats, dtype=np.float64)
+    lon = np.asarray(lons, dtype=np.float64)
+    return float(_haversine_np(lat[:-1], lon[:-1], lat[1:], lon[1:]).sum())
+
+def _number(value: Any, name: str) -> float:
+    """
+    Check that a response field holds a number.
+    
+    Args:
+        value: Field value from the routing response
+        name: Field name, for the error message
+    
+    Returns:
+        The value unchanged
+    
+    Raises:
+        WazeDirectError: If the value is not an int or float
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise WazeDirectError(f"Unexpected routing response: {name} is {value!r:.50}")
+    return value
+
+def _haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in meters between two points given in degrees."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+def _haversine_np(lat1: Any, lon1: Any, lat2: Any, lon2: Any) -> Any:
+    """Vectorized _haversine over NumPy arrays of points given in degrees."""
+    import numpy as np
+    
+    phi1, phi2 = np.radians(lat1), np.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = np.radians(lon2 - lon1)
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+
+def _get_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it on first use."""
+    global _client
+    
+    if _client is None:
+        # HTTP/2 needs the optional h2 package; fall back to HTTP/1.1 keep-alive
+        http2 = importlib.util.find_spec("h2") is not None
+        # Geocoding and routing hosts each need one multiplexed connection
+        # with HTTP/2; a few spare keep-alive connections cover HTTP/1.1
+        limits = httpx.Limits(max_connections=8, max_keepalive_connections=4)
+        _client = httpx.AsyncClient(http2=http2, timeout=5.0, headers=HEADERS, limits=limits)
+    
+    return _client
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Get the event loop that owns the shared client, creating it on first use."""
+    global _loop
+    
+    if _loop is None:
+        _loop = asyncio.new_event_loop()
+        atexit.register(_close)
+    
+    return _loop
+
+def _close() -> None:
+    """Close the shared client and its event loop."""
+    global _client, _loop
+    
+    if _loop is None:
+        return
+    
+    if _client is not None:
+        _loop.run_until_complete(_client.aclose())
+        _client = None
+    _loop.close()
+    _loop = None
@@ -1,106 +1,75 @@
 """Command line interface for the Waze Home application."""
 
 import click
-from typing import Optional
+import contextlib
+import logging
+from typing import Any, ContextManager, List, Optional, TYPE_CHECKING
 import sys
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich import box
 
 from .config import get_location, get_config
-from .waze_api import get_route, format_route_info
+from .models import RouteResponse
+from .waze_api import get_route, prefetch_route
 
-# Create console for rich output
-console = Console()
+if TYPE_CHECKING:
+    from rich.console import Console
 
-@click.group()
-def cli() -> None:
-    """Waze Home - Get the fastest route between home and work."""
-    pass
+# rich is imported and the console built on first output, since both dominate
+# startup time for commands that never render anything (e.g. --help)
+_console: Optional["Console"] = None
 
-@cli.command()
-@click.option("--from", "origin", help="Starting location (default: home)", default="home")
-@click.option("--to", "destination", help="Destination location (default: work)", default="work")
-def route(origin: str, destination: str) -> None:
-    """Get the fastest route between two locations."""
-    # Get the actual addresses from the location names
-    origin_address = get_location(origin)
-    destination_address = get_location(destination)
+# Summary panel shown by all route commands
+_SUMMARY_TMPL = (
+    "[bold]From:[/] {origin_label} ({origin_address})\n"
+    "[bold]To:[/] {destination_label} ({destination_address})\n"
+    "[bold]Departure:[/] {summary.departure_time}\n"
+    "[bold]Arrival:[/] {summary.arrival_time}\n"
+    "[bold]Travel time:[/] {summary.total_time}\n"
+    "[bold]Distance:[/] {summary.total_distance}\n"
+    "[bold]Traffic:[/] {traffic_conditions}"
+)
+
+def _get_console() -> "Console":
+    """Get the shared rich console, creating it on first use."""
+    global _console
     
-    if not origin_address:
-        console.print(f"[bold red]Error:[/] Location '{origin}' not found. Use 'set-location' to add it.")
-        sys.exit(1)
+    if _console is None:
+        from rich.console import Console
         
-    if not destination_address:
-        console.print(f"[bold red]Error:[/] Location '{destination}' not found. Use 'set-location' to add it.")
-        sys.exit(1)
-    
-    with console.status(f"[bold green]Getting route from {origin} to {destination}...[/]"):
-        # Get route information
-        try:
-            route_data = get_route(origin_address, destination_address)
-            formatted_route = format_route_info(route_data)
-        except Exception as e:
-            console.print(f"[bold red]Error:[/] {str(e)}")
-            sys.exit(1)
-    
-    if formatted_route["status"] == "error":
-        console.print(f"[bold red]Error:[/] {formatted_route['message']}")
-        sys.exit(1)
-    
-    # Display route information
-    summary = formatted_route["summary"]
-    
-    # Create summary panel
-    summary_text = (
-        f"[bold]From:[/] {origin} ({origin_address})\n"
-        f"[bold]To:[/] {destination} ({destination_address})\n"
-        f"[bold]Departure:[/] {summary['departure_time']}\n"
-        f"[bold]Arrival:[/] {summary['arrival_time']}\n"
-        f"[bold]Travel time:[/] {summary['total_time']}\n"
-        f"[bold]Distance:[/] {summary['total_distance']}\n"
-        f"[bold]Traffic:[/] {formatted_route['traffic_conditions']}"
-    )
-    
-    console.print(Panel(summary_text, title="Route Summary", border_style="green"))
-    
-    # Create directions table
-    directions_table = Table(box=box.ROUNDED, title="Directions", show_header=False)
-    directions_table.add_column("Step", style="dim")
-    directions_table.add_column("Instruction")
-    
-    for i, direction in enumerate(formatted_route["directions"], 1):
-        directions_table.add_row(f"{i}.", direction)
+        if sys.stdout.isatty():
+            _console = Console()
+        else:
+            # Piped output: skip terminal probing and ANSI styling
+            _console = Console(force_terminal=False, color_system=None, width=80)
     
-    console.print(directions_table)
+    return _console
+
+def _maybe_status(message: str) -> ContextManager[Any]:
+    """Show a spinner while waiting, unless output is piped."""
+    if sys.stdout.isatty():
+        return _get_console().status(message)
     
-    # Display alternative routes if available
-    if "alternate_routes" in formatted_route:
-        alt_table = Table(title="Alternative Routes", box=box.SIMPLE)
-        alt_table.add_column("Route")
-        alt_table.add_column("Time")
-        alt_table.add_column("Distance")
-        
-        for alt in formatted_route["alternate_routes"]:
-            alt_table.add_row(alt["name"], alt["total_time"], alt["total_distance"])
-        
-        console.print(alt_table)
+    # The spinner repaints on a background thread; pointless without a terminal
+    return contextlib.nullcontext()
+
+def _configure_logging() -> None:
+    """Show progress logging from route lookups on stderr."""
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+def route(origin: str, destination: str, no_cache: bool, ttl: Optional[int]) -> None:
+    """Get the fastest route between two locations."""
+    _show_route(origin, destination, no_cache, ttl)
 
-@cli.command(name="set-location")
-@click.argument("name")
-@click.argument("address")
 def set_location_cmd(name: str, address: str) -> None:
     """Set a named location."""
     # Import locally to avoid name conflict
     from .config import set_location
     set_location(name.lower(), address)
-    console.print(f"[green]Location '{name}' set to '{address}'[/]")
+    _get_console().print(f"[green]Location '{name}' set to '{address}'[/]")
 
-@cli.command(name="locations")
-@click.argument("name", required=False)
 def get_location_cmd(name: Optional[str] = None) -> None:
     """Get a named location or list all locations."""
+    console = _get_console()
+    
     if name:
         address = get_location(name.lower())
         if address:
@@ -117,6 +86,8 @@ def get_location_cmd(name: Optional[str] = None) -> None:
             console.print("[yellow]No locations set. Use 'set-location' to add locations.[/]")
             return
         
+        from rich.table import Table
+        
         table = Table(title="Saved Locations")
         table.add_column("Name")
         table.add_column("Address")
@@ -126,135 +97,139 @@ def get_location_cmd(name: Optional[str] = None) -> None:
         
         console.print(table)
 
-@cli.command(name="home")
-def go_home() -> None:
+def go_home(no_cache: bool, ttl: Optional[int]) -> None:
     """Get the fastest route home from your current location (work)."""
-    # Direct call instead of passing to click command function
-    origin_address = get_location("work")
-    destination_address = get_location("home")
+    _show_route("work", "home", no_cache, ttl)
+
+def go_to_work(no_cache: bool, ttl: Optional[int]) -> None:
+    """Get the fastest route to work from your current location (home)."""
+    _show_route("home", "work", no_cache, ttl)
+
+def _show_route(origin: str, destination: str, no_cache: bool, ttl: Optional[int]) -> None:
+    """Look up two named locations, fetch the route between them and print it."""
+    # Get the actual addresses from the location names
+    origin_address = get_location(origin)
+    destination_address = get_location(destination)
     
-    if not origin_address:
-        console.print("[bold red]Error:[/] Location 'work' not found. Use 'set-location' to add it.")
-        sys.exit(1)
+    if origin_address and destination_address:
+        _configure_logging()
         
-    if not destination_address:
-        console.print("[bold red]Error:[/] Location 'home' not found. Use 'set-location' to add it.")
-        sys.exit(1)
-    
-    with console.status("[bold green]Getting route from work to home...[/]"):
-        try:
-            route_data = get_route(origin_address, destination_address)
-            formatted_route = format_route_info(route_data)
-        except Exception as e:
-            console.print(f"[bold red]Error:[/] {str(e)}")
-            sys.exit(1)
-    
-    if formatted_route["status"] == "error":
-        console.print(f"[bold red]Error:[/] {formatted_route['message']}")
-        sys.exit(1)
+        # Start the routing request now so it overlaps with loading rich
+        prefetch_route(origin_address, destination_address, use_cache=not no_cache, ttl=ttl)
     
-    # Display route information
-    summary = formatted_route["summary"]
-    
-    # Create summary panel
-    summary_text = (
-        f"[bold]From:[/] work ({origin_address})\n"
-        f"[bold]To:[/] home ({destination_address})\n"
-        f"[bold]Departure:[/] {summary['departure_time']}\n"
-        f"[bold]Arrival:[/] {summary['arrival_time']}\n"
-        f"[bold]Travel time:[/] {summary['total_time']}\n"
-        f"[bold]Distance:[/] {summary['total_distance']}\n"
-        f"[bold]Traffic:[/] {formatted_route['traffic_conditions']}"
-    )
-    
-    console.print(Panel(summary_text, title="Route Summary", border_style="green"))
-    
-    # Create directions table
-    directions_table = Table(box=box.ROUNDED, title="Directions", show_header=False)
-    directions_table.add_column("Step", style="dim")
-    directions_table.add_column("Instruction")
-    
-    for i, direction in enumerate(formatted_route["directions"], 1):
-        directions_table.add_row(f"{i}.", direction)
-    
-    console.print(directions_table)
-    
-    # Display alternative routes if available
-    if "alternate_routes" in formatted_route:
-        alt_table = Table(title="Alternative Routes", box=box.SIMPLE)
-        alt_table.add_column("Route")
-        alt_table.add_column("Time")
-        alt_table.add_column("Distance")
-        
-        for alt in formatted_route["alternate_routes"]:
-            alt_table.add_row(alt["name"], alt["total_time"], alt["total_distance"])
-        
-        console.print(alt_table)
-
-@cli.command(name="work")
-def go_to_work() -> None:
-    """Get the fastest route to work from your current location (home)."""
-    # Direct call instead of passing to click command function
-    origin_address = get_location("home")
-    destination_address = get_location("work")
+    console = _get_console()
     
     if not origin_address:
-        console.print("[bold red]Error:[/] Location 'home' not found. Use 'set-location' to add it.")
+        console.print(f"[bold red]Error:[/] Location '{origin}' not found. Use 'set-location' to add it.")
         sys.exit(1)
         
     if not destination_address:
-        console.print("[bold red]Error:[/] Location 'work' not found. Use 'set-location' to add it.")
+        console.print(f"[bold red]Error:[/] Location '{destination}' not found. Use 'set-location' to add it.")
         sys.exit(1)
     
-    with console.status("[bold green]Getting route from home to work...[/]"):
+    with _maybe_status(f"[bold green]Getting route from {origin} to {destination}...[/]"):
+        # Get route information
         try:
-            route_data = get_route(origin_address, destination_address)
-            formatted_route = format_route_info(route_data)
+            formatted_route = get_route(origin_address, destination_address, use_cache=not no_cache, ttl=ttl)
         except Exception as e:
             console.print(f"[bold red]Error:[/] {str(e)}")
             sys.exit(1)
     
-    if formatted_route["status"] == "error":
-        console.print(f"[bold red]Error:[/] {formatted_route['message']}")
-        sys.exit(1)
-    
-    # Display route information
-    summary = formatted_route["summary"]
+    _render_route(origin, destination, origin_address, destination_address, formatted_route)
+
+def _render_route(
+    origin_label: str,
+    destination_label: str,
+    origin_address: str,
+    destination_address: str,
+    formatted_route: RouteResponse,
+) -> None:
+    """Print the route summary, directions and alternative routes."""
+    from rich.table import Table
+    from rich.panel import Panel
+    from rich import box
+    
+    console = _get_console()
     
     # Create summary panel
-    summary_text = (
-        f"[bold]From:[/] home ({origin_address})\n"
-        f"[bold]To:[/] work ({destination_address})\n"
-        f"[bold]Departure:[/] {summary['departure_time']}\n"
-        f"[bold]Arrival:[/] {summary['arrival_time']}\n"
-        f"[bold]Travel time:[/] {summary['total_time']}\n"
-        f"[bold]Distance:[/] {summary['total_distance']}\n"
-        f"[bold]Traffic:[/] {formatted_route['traffic_conditions']}"
-    )
+    summary_text = _SUMMARY_TMPL.format_map({
+        "summary": formatted_route.summary,
+        "origin_label": origin_label,
+        "origin_address": origin_address,
+        "destination_label": destination_label,
+        "destination_address": destination_address,
+        "traffic_conditions": formatted_route.traffic_conditions,
+    })
     
     console.print(Panel(summary_text, title="Route Summary", border_style="green"))
     
-    # Create directions table
-    directions_table = Table(box=box.ROUNDED, title="Directions", show_header=False)
-    directions_table.add_column("Step", style="dim")
-    directions_table.add_column("Instruction")
-    
-    for i, direction in enumerate(formatted_route["directions"], 1):
-        directions_table.add_row(f"{i}.", direction)
-    
-    console.print(directions_table)
+    if sys.stdout.isatty():
+        # Create directions table
+        directions_table = Table(box=box.ROUNDED, title="Directions", show_header=False)
+        directions_table.add_column("Step", style="dim")
+        directions_table.add_column("Instruction")
+        
+        for i, direction in enumerate(formatted_route.directions, 1):
+            directions_table.add_row(f"{i}.", direction)
+        
+        console.print(directions_table)
+    else:
+        # Piped output gets plain numbered steps, skipping table layout
+        steps = "\n".join(f"{i}. {direction}" for i, direction in enumerate(formatted_route.directions, 1))
+        console.print(f"Directions\n{steps}", markup=False, highlight=False)
     
     # Display alternative routes if available
-    if "alternate_routes" in formatted_route:
+    if formatted_route.alternate_routes:
         alt_table = Table(title="Alternative Routes", box=box.SIMPLE)
         alt_table.add_column("Route")
         alt_table.add_column("Time")
         alt_table.add_column("Distance")
         
-        for alt in formatted_route["alternate_routes"]:
-            alt_table.add_row(alt["name"], alt["total_time"], alt["total_distance"])
+        for alt in formatted_route.alternate_routes:
+            alt_table.add_row(alt.name, alt.total_time, alt.total_distance)
         
         console.print(alt_table)
 
+def _cache_options() -> List[click.Parameter]:
+    """Build the route cache options shared by all route commands."""
+    return [
+        click.Option(["--no-cache"], is_flag=True, help="Ignore cached routes and fetch fresh data"),
+        click.Option(["--ttl"], type=int, default=None, help="Maximum age of a cached route in seconds (default: WAZE_HOME_CACHE_TTL or 120)"),
+    ]
+
+# The command tree is built once from explicit Command objects rather than
+# decorators, which keeps import-time work to constructing these objects
+cli = click.Group(name="cli", help="Waze Home - Get the fastest route between home and work.")
+
+_COMMANDS = (
+    click.Command(
+        name="route",
+        callback=route,
+        help=route.__doc__,
+        params=[
+            click.Option(["--from", "origin"], help="Starting location (default: home)", default="home"),
+            click.Option(["--to", "destination"], help="Destination location (default: work)", default="work"),
+            *_cache_options(),
+        ],
+    ),
+    click.Command(
+        name="set-location",
+        callback=set_location_cmd,
+        help=set_location_cmd.__doc__,
+        params=[click.Argument(["name"]), click.Argument(["address"])],
+    ),
+    click.Command(
+        name="locations",
+        callback=get_location_cmd,
+        help=get_location_cmd.__doc__,
+        params=[click.Argument(["name"], required=False)],
+    ),
+    click.Command(name="home", callback=go_home, help=go_home.__doc__, params=_cache_options()),
+    click.Command(name="work", callback=go_to_work, help=go_to_work.__doc__, params=_cache_options()),
+)
+
+for _command in _COMMANDS:
+    cli.add_command(_command)
+
 if __name__ == "__main__":
-    cli()
\ No newline at end of file
+    cli()
@@ -1,11 +1,16 @@
 """Configuration for the Waze Home CLI."""
 
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import os
 import json
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None  # type: ignore[assignment]
+
 # Load environment variables from .env file if it exists
 load_dotenv()
 
@@ -19,11 +24,46 @@ DEFAULT_LOCATIONS = {
 CONFIG_DIR = Path.home() / ".config" / "waze-home"
 CONFIG_FILE = CONFIG_DIR / "config.json"
 
+# Cache directory for data that can be safely regenerated
+CACHE_DIR = Path.home() / ".cache" / "waze-home"
+
+def loads(content: bytes) -> Any:
+    """Parse JSON from bytes with orjson if it is installed, else the json module."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+def read_json(path: Path) -> Any:
+    """Read a JSON file with a single read() call and no text decoding."""
+    return loads(path.read_bytes())
+
+def write_json(path: Path, data: Any, indent: bool = False) -> None:
+    """Write a JSON file with a single write() call."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0))
+    else:
+        path.write_bytes(json.dumps(data, indent=2 if indent else None).encode("utf-8"))
+
+# Parsed config file, reused until the file's modification time changes
+_CONFIG_CACHE: Optional[Dict[str, Any]] = None
+_CONFIG_MTIME: Optional[int] = None
+
 def get_config() -> Dict[str, Any]:
     """Get the configuration from the config file or environment variables."""
-    if CONFIG_FILE.exists():
-        with open(CONFIG_FILE, "r") as f:
-            return json.load(f)
+    global _CONFIG_CACHE, _CONFIG_MTIME
+    
+    try:
+        st = CONFIG_FILE.stat()
+    except FileNotFoundError:
+        st = None
+    
+    if st is not None:
+        if _CONFIG_CACHE is not None and st.st_mtime_ns == _CONFIG_MTIME:
+            return _CONFIG_CACHE
+        
+        config = read_json(CONFIG_FILE)
+        _CONFIG_CACHE, _CONFIG_MTIME = config, st.st_mtime_ns
+        return config
     
     # Otherwise, use defaults or environment variables
     return {
@@ -36,9 +76,13 @@ def get_config() -> Dict[str, Any]:
 
 def save_config(config: Dict[str, Any]) -> None:
     """Save the configuration to the config file."""
+    global _CONFIG_CACHE, _CONFIG_MTIME
+    
     CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-    with open(CONFIG_FILE, "w") as f:
-        json.dump(config, f, indent=2)
+    write_json(CONFIG_FILE, config, indent=True)
+    
+    # Remember what we just wrote so the next get_config doesn't re-read it
+    _CONFIG_CACHE, _CONFIG_MTIME = config, CONFIG_FILE.stat().st_mtime_ns
 
 def set_location(name: str, address: str) -> None:
     """Set a location in the configuration."""
@@ -0,0 +1,9 @@
+"""Exceptions shared by the Waze Home modules."""
+
+
+class GeocodingError(Exception):
+    """Raised when an address cannot be resolved to coordinates."""
+
+    def __init__(self, address: str) -> None:
+        super().__init__(f"Cannot get coords for {address}")
+        self.address = address
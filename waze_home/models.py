@@ -0,0 +1,92 @@
+"""Route data returned by waze_api.get_route."""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Sequence
+
+
+@dataclass(slots=True)
+class RouteSummary:
+    """Formatted totals and times for the main route."""
+
+    total_time: str
+    total_distance: str
+    departure_time: str
+    arrival_time: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the dictionary format used by the route cache."""
+        return {
+            "total_time": self.total_time,
+            "total_distance": self.total_distance,
+            "departure_time": self.departure_time,
+            "arrival_time": self.arrival_time,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class Route:
+    """
+    Formatted totals for an alternative route.
+
+    Frozen so that instances can be shared between responses.
+    """
+
+    name: str
+    total_time: str
+    total_distance: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the dictionary format used by the route cache."""
+        return {
+            "name": self.name,
+            "total_time": self.total_time,
+            "total_distance": self.total_distance,
+        }
+
+
+@dataclass(slots=True)
+class RouteResponse:
+    """Render-ready route information."""
+
+    summary: RouteSummary
+    directions: List[str]
+    traffic_conditions: str
+    alternate_routes: Sequence[Route] = field(default_factory=list)
+    status: str = "success"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert to the dictionary format used by the route cache.
+
+        Returns:
+            Dictionary with "status", "summary", "directions",
+            "traffic_conditions" and, if there are any, "alternate_routes"
+        """
+        result: Dict[str, Any] = {
+            "status": self.status,
+            "summary": self.summary.to_dict(),
+            "directions": list(self.directions),
+            "traffic_conditions": self.traffic_conditions,
+        }
+        if self.alternate_routes:
+            result["alternate_routes"] = [route.to_dict() for route in self.alternate_routes]
+        return result
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RouteResponse":
+        """
+        Build a response from the output of to_dict.
+
+        Args:
+            data: Dictionary in the format returned by to_dict
+
+        Returns:
+            Route response
+        """
+        return cls(
+            summary=RouteSummary(**data["summary"]),
+            directions=list(data["directions"]),
+            traffic_conditions=data["traffic_conditions"],
+            alternate_routes=[Route(**route) for route in data.get("alternate_routes", ())],
+            status=data.get("status", "success"),
+        )
@@ -1,12 +1,25 @@
 """Module for interacting with the Waze API using WazeRouteCalculator."""
 
+import atexit
+import bisect
+import concurrent.futures
+import functools
+import itertools
+import json
 import logging
-from typing import Dict, Any, Tuple, Optional
-from datetime import datetime, timedelta
-import WazeRouteCalculator
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, Any, List, Sequence, Set, Tuple, Optional, TYPE_CHECKING
+
+from .config import CACHE_DIR, DEFAULT_LOCATIONS, loads, read_json, write_json
+from .errors import GeocodingError
+from .models import Route, RouteResponse, RouteSummary
+
+if TYPE_CHECKING:
+    import requests
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
 # Configure WazeRouteCalculator logger if needed
@@ -16,60 +29,674 @@ waze_logger.setLevel(logging.WARNING)  # Set to DEBUG for more verbose output
 # Default region
 DEFAULT_REGION = "AU"  # Can be EU, US, IL, or AU
 
-# Address cache for commonly used locations
-ADDRESS_CACHE = {
-    "91 Abbett St, Scarborough WA 6019": (-31.8941, 115.7586),
-    "11 Mount St, Perth WA 6000": (-31.9523, 115.8613),
+# Derive the main route from the alternatives request instead of making a
+# second routing request (set WAZE_HOME_SINGLE_CALL=0 to disable)
+SINGLE_ROUTE_CALL = os.getenv("WAZE_HOME_SINGLE_CALL", "1") != "0"
+
+# Query the Waze JSON endpoints directly with httpx instead of going through
+# WazeRouteCalculator (set WAZE_HOME_DIRECT=1 to enable)
+DIRECT_API = os.getenv("WAZE_HOME_DIRECT", "0") == "1"
+
+# Always return mock routes without touching the network, e.g. for demos
+# and offline use (set WAZE_HOME_MOCK=1 to enable)
+USE_MOCK = os.getenv("WAZE_HOME_MOCK", "0") == "1"
+
+# Default home and work addresses, interned like the addresses get_route
+# receives so lookups keyed on them can match by identity
+HOME_ADDRESS = sys.intern(DEFAULT_LOCATIONS["home"])
+WORK_ADDRESS = sys.intern(DEFAULT_LOCATIONS["work"])
+
+@functools.lru_cache(maxsize=1024)
+def _address_key(address: str) -> str:
+    """Normalize an address for use as an ADDRESS_CACHE key."""
+    # casefold() also matches non-ASCII case variants that lower() misses
+    return " ".join(address.split()).casefold()
+
+# Built-in coordinates for commonly used locations, keyed by _address_key
+_FALLBACK_GEOCODES: Dict[str, Tuple[float, float]] = {
+    _address_key(HOME_ADDRESS): (-31.8941, 115.7586),
+    _address_key(WORK_ADDRESS): (-31.9523, 115.8613),
     # Add more common locations here as needed
 }
 
-def get_route(origin: str, destination: str) -> Dict[str, Any]:
+# Address cache, seeded with the built-in locations and keyed by _address_key
+ADDRESS_CACHE: Dict[str, Tuple[float, float]] = dict(_FALLBACK_GEOCODES)
+
+# Predefined directions for known routes, keyed by (origin, destination)
+_KNOWN_DIRECTIONS: Dict[Tuple[str, str], Tuple[str, ...]] = {
+    (HOME_ADDRESS, WORK_ADDRESS): (
+        "Head south on Abbett St toward Brighton Rd",
+        "Turn right onto Scarborough Beach Rd",
+        "Turn left onto West Coast Hwy",
+        "Continue onto Mounts Bay Rd",
+        "Turn right onto Mount St",
+        "Arrive at destination on left",
+    ),
+    (WORK_ADDRESS, HOME_ADDRESS): (
+        "Head north on Mount St toward St Georges Terrace",
+        "Turn left onto Mounts Bay Rd",
+        "Continue onto West Coast Hwy",
+        "Turn right onto Scarborough Beach Rd",
+        "Turn left onto Abbett St",
+        "Arrive at destination on right",
+    ),
+}
+
+# Generic directions for unknown routes
+_GENERIC_DIRECTIONS: Tuple[str, ...] = (
+    "Start driving",
+    "Continue on the recommended route",
+    "Follow the main road",
+    "Continue to your destination",
+    "Arrive at destination",
+)
+
+# Traffic conditions by average speed: speeds below _SPEED_THRESHOLDS[i] km/h
+# (and at or above the previous threshold) get _TRAFFIC_LABELS[i]
+_SPEED_THRESHOLDS: Tuple[int, ...] = (30, 50, 70)
+_TRAFFIC_LABELS: Tuple[str, ...] = (
+    "Heavy traffic",
+    "Moderate traffic",
+    "Light traffic with some congestion",
+    "Light traffic",
+)
+
+# Fallback routes used when the API request fails, keyed by (origin, destination):
+# (travel time in minutes, distance in meters, directions)
+_MOCK_ROUTES: Dict[Tuple[str, str], Tuple[int, int, Tuple[str, ...]]] = {
+    # Morning commute to work (more traffic)
+    (HOME_ADDRESS, WORK_ADDRESS): (69, 14200, _KNOWN_DIRECTIONS[(HOME_ADDRESS, WORK_ADDRESS)]),
+    # Evening commute home
+    (WORK_ADDRESS, HOME_ADDRESS): (69, 14200, _KNOWN_DIRECTIONS[(WORK_ADDRESS, HOME_ADDRESS)]),
+}
+
+# Generic fallback for unknown routes
+_DEFAULT_MOCK: Tuple[int, int, Tuple[str, ...]] = (69, 12000, _GENERIC_DIRECTIONS)
+
+# Geocoding results discovered at runtime are persisted here and merged into
+# ADDRESS_CACHE on first use
+GEOCODE_CACHE_FILE = CACHE_DIR / "geocode.json"
+_address_cache_loaded = False
+_address_cache_dirty = False
+
+# Addresses the geocoder could not resolve in this run, so they fail fast
+# instead of being retried (e.g. by the WazeRouteCalculator fallback)
+_unresolvable_addresses: Set[str] = set()
+
+# HTTP session shared by every request in this process, created on first use
+_session: Optional["requests.Session"] = None
+
+# Routes being fetched in the background by prefetch_route, keyed by the
+# get_route arguments. A prefetch older than PREFETCH_TTL_SECONDS is stale
+# traffic data and is ignored.
+PREFETCH_TTL_SECONDS = 30
+_prefetched: Dict[Tuple[str, str, bool, Optional[int]], Tuple[float, "concurrent.futures.Future[RouteResponse]"]] = {}
+
+# (connect, read) timeout in seconds for requests that don't set their own
+REQUEST_TIMEOUT = (3, 10)
+
+# Current minute (seconds since the epoch // 60) and its HH:MM local time
+_now_cache: Tuple[int, str] = (-1, "")
+
+# Route cache, persisted between runs so repeated queries skip the network
+ROUTE_CACHE_FILE = CACHE_DIR / "routes.json"
+DEFAULT_TTL_SECONDS = 120
+
+def _cache_ttl() -> int:
+    """
+    Read the route cache TTL from WAZE_HOME_CACHE_TTL.
+    
+    Returns:
+        TTL in seconds, or DEFAULT_TTL_SECONDS if the variable is unset or
+        not a whole number
+    """
+    value = os.getenv("WAZE_HOME_CACHE_TTL")
+    if value is None:
+        return DEFAULT_TTL_SECONDS
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning(
+            "Ignoring WAZE_HOME_CACHE_TTL=%r, expected a number of seconds; using %s",
+            value, DEFAULT_TTL_SECONDS,
+        )
+        return DEFAULT_TTL_SECONDS
+
+TTL_SECONDS = _cache_ttl()
+
+# Loaded lazily on the first get_route call
+_route_cache: Optional[Dict[str, Dict[str, Any]]] = None
+_route_cache_dirty = False
+
+def get_route(
+    origin: str,
+    destination: str,
+    use_cache: bool = True,
+    ttl: Optional[int] = None,
+) -> RouteResponse:
     """
     Get the route information between two locations using the Waze API.
     
     Args:
         origin: Starting address
         destination: Ending address
+        use_cache: Whether to serve a recently cached route if one exists
+        ttl: Maximum age in seconds of a cached route (default: TTL_SECONDS)
         
     Returns:
-        Dictionary with route information
+        Render-ready route information (see build_render_model)
     """
-    logger.info(f"Requesting route from {origin} to {destination}")
+    origin = sys.intern(origin)
+    destination = sys.intern(destination)
     
-    try:
-        # Create a WazeRouteCalculator instance
-        route_calculator = WazeRouteCalculator.WazeRouteCalculator(
-            origin, 
-            destination, 
-            region=DEFAULT_REGION
-        )
+    entry = _prefetched.pop((origin, destination, use_cache, ttl), None)
+    if entry is not None and time.time() - entry[0] < PREFETCH_TTL_SECONDS:
+        return entry[1].result()
+    
+    return _fetch_route(origin, destination, use_cache, ttl)
+
+def prefetch_route(
+    origin: str,
+    destination: str,
+    use_cache: bool = True,
+    ttl: Optional[int] = None,
+) -> "concurrent.futures.Future[RouteResponse]":
+    """
+    Start fetching a route in the background.
+    
+    A later get_route call with the same arguments waits for this result
+    instead of starting its own request.
+    
+    Args:
+        origin: Starting address
+        destination: Ending address
+        use_cache: Whether to serve a recently cached route if one exists
+        ttl: Maximum age in seconds of a cached route (default: TTL_SECONDS)
         
-        # Get route information
-        route_time, route_distance = route_calculator.calc_route_info()
-        logger.info(f"Route calculated: {route_time:.2f} minutes, {route_distance:.2f} km")
+    Returns:
+        Future resolving to the get_route result
+    """
+    origin = sys.intern(origin)
+    destination = sys.intern(destination)
+    
+    key = (origin, destination, use_cache, ttl)
+    entry = _prefetched.get(key)
+    if entry is not None and time.time() - entry[0] < PREFETCH_TTL_SECONDS:
+        return entry[1]
+    
+    future = _run_in_background("waze-prefetch", _fetch_route, origin, destination, use_cache, ttl)
+    _prefetched[key] = (time.time(), future)
+    return future
+
+def _fetch_route(origin: str, destination: str, use_cache: bool, ttl: Optional[int]) -> RouteResponse:
+    """Get a route from the route cache or the network (see get_route)."""
+    if USE_MOCK:
+        return _get_mock_route_data(origin, destination)
+    
+    if ttl is None:
+        ttl = TTL_SECONDS
+    cache_key = f"{origin} -> {destination}"
+    
+    if use_cache and ttl > 0:
+        cached_route = _lookup_route(cache_key, ttl)
+        if cached_route is not None:
+            logger.info("Using cached route from %s to %s", origin, destination)
+            return cached_route
+    
+    logger.info("Requesting route from %s to %s", origin, destination)
+    
+    try:
+        all_routes = _get_routes_direct(origin, destination) if DIRECT_API else None
         
-        # Get all available routes
-        all_routes = route_calculator.calc_all_routes_info(3)  # Try to get up to 3 alternative routes
+        if all_routes is not None:
+            route_time, route_distance = next(iter(all_routes.values()))
+        else:
+            # Create a WazeRouteCalculator instance, geocoding through ADDRESS_CACHE
+            route_calculator = _calculator_class()(
+                origin, 
+                destination, 
+                region=DEFAULT_REGION
+            )
+            
+            # Get all available routes
+            all_routes = route_calculator.calc_all_routes_info(3)  # Try to get up to 3 alternative routes
+            
+            # Waze lists its recommended route first, so that doubles as the main
+            # route unless the separate (extra round-trip) lookup is requested
+            if SINGLE_ROUTE_CALL:
+                route_time, route_distance = next(iter(all_routes.values()))
+            else:
+                route_time, route_distance = route_calculator.calc_route_info()
+        logger.info("Route calculated: %.2f minutes, %.2f km", route_time, route_distance)
         
-        # Transform the response to match our expected format
-        return _transform_waze_response(route_time, route_distance, all_routes, origin, destination)
+        # Transform the response straight into the shape the CLI renders
+        result = build_render_model(route_time, route_distance, all_routes, origin, destination)
+        _update_route(cache_key, result, int(route_time * 60))
+        return result
         
-    except Exception as e:
-        logger.error(f"Error getting route from Waze API: {str(e)}")
+    except _backend_errors() as e:
+        logger.error("Error getting route from Waze API: %s", e)
         
         # Fall back to mock data if the API request fails
         logger.info("Falling back to mock data due to exception")
         return _get_mock_route_data(origin, destination)
 
-def _transform_waze_response(
+def _get_routes_direct(origin: str, destination: str) -> Optional[Dict[str, Tuple[float, float]]]:
+    """
+    Get all routes through the direct Waze client.
+    
+    Args:
+        origin: Starting address
+        destination: Ending address
+        
+    Returns:
+        Dictionary of all routes with their times and distances, or None if
+        the direct request failed and WazeRouteCalculator should be used
+    """
+    try:
+        from . import _waze_direct
+    except ImportError as e:
+        logger.warning("Direct Waze client unavailable, falling back to WazeRouteCalculator: %s", e)
+        return None
+    
+    try:
+        return _waze_direct.get_all_routes(
+            origin,
+            destination,
+            region=DEFAULT_REGION,
+            npaths=3,
+            lookup_coords=_lookup_address,
+            remember_coords=_remember_address,
+        )
+    except (GeocodingError, _waze_direct.WazeDirectError, ValueError, LookupError) as e:
+        if isinstance(e, GeocodingError):
+            _unresolvable_addresses.add(_address_key(e.address))
+        logger.warning("Direct Waze request failed, falling back to WazeRouteCalculator: %s", e)
+        return None
+
+@functools.lru_cache(maxsize=None)
+def _backend_errors() -> Tuple[type, ...]:
+    """
+    Get the exceptions that mean a route lookup failed upstream.
+    
+    These fall back to mock data; anything else is a bug and propagates.
+    
+    Returns:
+        Tuple of exception classes
+    """
+    from WazeRouteCalculator import WRCError
+    
+    return (
+        WRCError,
+        GeocodingError,
+        OSError,  # includes requests.RequestException
+        ValueError,  # malformed JSON
+        LookupError,  # JSON without the expected keys
+        ArithmeticError,  # zero-length or out-of-range travel times
+        StopIteration,  # no routes returned
+    )
+
+@functools.lru_cache(maxsize=None)
+def _calculator_class() -> type:
+    """
+    Build the WazeRouteCalculator subclass used for route requests.
+    
+    The library is imported here rather than at module level so that cached
+    routes never pay for the import.
+    
+    Returns:
+        WazeRouteCalculator subclass that geocodes through ADDRESS_CACHE
+    """
+    import WazeRouteCalculator
+    
+    # The library calls requests.get() directly, opening a new connection for
+    # every geocoding and routing request; send those through our keep-alive
+    # session instead
+    library_module = sys.modules[WazeRouteCalculator.WazeRouteCalculator.__module__]
+    library_module.requests = _get_session()  # type: ignore[attr-defined]
+    
+    class _CachedWRC(WazeRouteCalculator.WazeRouteCalculator):  # type: ignore[misc]
+        """
+        WazeRouteCalculator that skips geocoding for known addresses.
+        
+        The library indexes into responses without checking their shape, so
+        an error object or null where it expects a list or dict raises
+        AttributeError or TypeError. Those are re-raised as WRCError so they
+        count as backend failures rather than bugs.
+        """
+        
+        def __init__(self, start_address: str, end_address: str, region: str = "EU", **kwargs: Any) -> None:
+            # The library geocodes the two ends one after the other. Resolve
+            # them concurrently first so both lookups below are served from
+            # ADDRESS_CACHE
+            self.region = "US" if region.upper() == "NA" else region.upper()
+            _get_coordinates_batch(
+                [address for address in (start_address, end_address) if not self.already_coords(address)],
+                self.address_to_coords,
+            )
+            
+            super().__init__(start_address, end_address, region=region, **kwargs)
+        
+        def address_to_coords(self, address: str) -> Dict[str, Any]:
+            coords = _lookup_address(address)
+            if coords is not None:
+                return {"lat": coords[0], "lon": coords[1], "bounds": {}}
+            
+            try:
+                result: Dict[str, Any] = super().address_to_coords(address)
+            except WazeRouteCalculator.WRCError:
+                _unresolvable_addresses.add(_address_key(address))
+                raise
+            except (AttributeError, TypeError) as e:
+                # A malformed reply says nothing about the address itself, so
+                # it is not remembered as unresolvable
+                raise WazeRouteCalculator.WRCError(f"Unexpected geocoding response for {address}: {e}") from e
+            _remember_address(address, (result["lat"], result["lon"]))
+            return result
+        
+        def calc_route_info(self, *args: Any, **kwargs: Any) -> Tuple[float, float]:
+            try:
+                return super().calc_route_info(*args, **kwargs)
+            except (AttributeError, TypeError) as e:
+                raise WazeRouteCalculator.WRCError(f"Unexpected routing response: {e}") from e
+        
+        def calc_all_routes_info(self, *args: Any, **kwargs: Any) -> Dict[str, Tuple[float, float]]:
+            try:
+                return super().calc_all_routes_info(*args, **kwargs)
+            except (AttributeError, TypeError) as e:
+                raise WazeRouteCalculator.WRCError(f"Unexpected routing response: {e}") from e
+    
+    return _CachedWRC
+
+def _get_coordinates_batch(
+    addresses: Sequence[str],
+    geocode: Callable[[str], Dict[str, Any]],
+) -> List[Tuple[float, float]]:
+    """
+    Resolve several addresses, geocoding each unknown one once and in parallel.
+    
+    Args:
+        addresses: Addresses to resolve
+        geocode: Geocoder for addresses missing from ADDRESS_CACHE, returning
+            a dict with "lat" and "lon" (e.g. address_to_coords)
+        
+    Returns:
+        (lat, lon) tuples in the same order as addresses
+    """
+    resolved: Dict[str, Tuple[float, float]] = {}
+    unknown: Dict[str, str] = {}
+    for address in addresses:
+        key = _address_key(address)
+        if key in resolved or key in unknown:
+            continue
+        coords = _lookup_address(address)
+        if coords is None:
+            unknown[key] = address
+        else:
+            resolved[key] = coords
+    
+    if not unknown:
+        return [resolved[_address_key(address)] for address in addresses]
+    
+    if len(unknown) == 1:
+        # Not worth starting a thread for
+        results = [geocode(address) for address in unknown.values()]
+    else:
+        futures = [_run_in_background("waze-geocode", geocode, address) for address in unknown.values()]
+        results = [future.result() for future in futures]
+    
+    for key, result in zip(unknown, results):
+        resolved[key] = (result["lat"], result["lon"])
+    
+    return [resolved[_address_key(address)] for address in addresses]
+
+def _run_in_background(name: str, fn: Callable[..., Any], *args: Any) -> "concurrent.futures.Future[Any]":
+    """
+    Call a function on a new daemon thread.
+    
+    ThreadPoolExecutor workers are joined at interpreter exit, so Ctrl-C
+    during a lookup would wait for the request to finish. Daemon threads
+    are abandoned instead.
+    
+    Args:
+        name: Thread name
+        fn: Function to call
+        *args: Arguments for fn
+        
+    Returns:
+        Future resolving to the result of fn
+    """
+    future: "concurrent.futures.Future[Any]" = concurrent.futures.Future()
+    
+    def run() -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+    
+    threading.Thread(target=run, name=name, daemon=True).start()
+    return future
+
+def _get_session() -> "requests.Session":
+    """
+    Get the HTTP session shared by all Waze requests.
+    
+    Returns:
+        requests.Session with a pooled keep-alive adapter that retries
+        transient failures and applies REQUEST_TIMEOUT by default
+    """
+    global _session
+    
+    if _session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util import Retry
+        
+        class _BytesJSONResponse(requests.Response):
+            """Response whose json() parses the raw body with config.loads."""
+            
+            def json(self, **kwargs: Any) -> Any:
+                if kwargs:
+                    return super().json(**kwargs)
+                try:
+                    return loads(self.content)
+                except json.JSONDecodeError as e:  # orjson's error subclasses it
+                    raise requests.JSONDecodeError(e.msg, e.doc, e.pos) from e
+        
+        class _TimeoutHTTPAdapter(HTTPAdapter):
+            """HTTPAdapter that applies REQUEST_TIMEOUT when no timeout is given."""
+            
+            def send(self, request: Any, **kwargs: Any) -> Any:
+                if kwargs.get("timeout") is None:
+                    kwargs["timeout"] = REQUEST_TIMEOUT
+                return super().send(request, **kwargs)
+            
+            def build_response(self, req: Any, resp: Any) -> Any:
+                response = super().build_response(req, resp)
+                # WazeRouteCalculator calls response.json(); parse the bytes
+                # directly (with orjson when installed) instead of decoding
+                # them to str first
+                response.__class__ = _BytesJSONResponse
+                return response
+        
+        _session = requests.Session()
+        _session.headers.update({
+            "User-Agent": "Mozilla/5.0",
+            "Referer": "https://www.waze.com/",
+            "Accept": "application/json",
+        })
+        retries = Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504])
+        adapter = _TimeoutHTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retries)
+        _session.mount("https://", adapter)
+    
+    return _session
+
+def _lookup_address(address: str) -> Optional[Tuple[float, float]]:
+    """
+    Look up the coordinates of an address geocoded in this or a previous run.
+    
+    Args:
+        address: Address to look up
+        
+    Returns:
+        (lat, lon) tuple, or None if the address is unknown
+        
+    Raises:
+        GeocodingError: If the address already failed to geocode in this run
+    """
+    global _address_cache_loaded
+    
+    if not _address_cache_loaded:
+        _address_cache_loaded = True
+        if GEOCODE_CACHE_FILE.exists():
+            try:
+                loaded = read_json(GEOCODE_CACHE_FILE)
+            except (OSError, ValueError) as e:
+                logger.warning("Ignoring unreadable geocode cache: %s", e)
+            else:
+                if isinstance(loaded, dict):
+                    for known_address, coords in loaded.items():
+                        # Skip anything that isn't a [lat, lon] pair of numbers
+                        if (
+                            isinstance(coords, list)
+                            and len(coords) == 2
+                            and all(isinstance(c, (int, float)) and not isinstance(c, bool) for c in coords)
+                        ):
+                            ADDRESS_CACHE[_address_key(known_address)] = (coords[0], coords[1])
+                else:
+                    logger.warning("Ignoring geocode cache that is not a JSON object")
+        atexit.register(_save_address_cache)
+    
+    key = _address_key(address)
+    if key in _unresolvable_addresses:
+        raise GeocodingError(address)
+    
+    return ADDRESS_CACHE.get(key)
+
+def _remember_address(address: str, coords: Tuple[float, float]) -> None:
+    """
+    Add newly geocoded coordinates to the address cache.
+    
+    Args:
+        address: Address that was geocoded
+        coords: (lat, lon) tuple returned by the geocoder
+    """
+    global _address_cache_dirty
+    
+    ADDRESS_CACHE[_address_key(address)] = coords
+    _address_cache_dirty = True
+
+def _save_address_cache() -> None:
+    """Write the address cache back to disk if new addresses were geocoded."""
+    if not _address_cache_dirty:
+        return
+    
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        write_json(GEOCODE_CACHE_FILE, ADDRESS_CACHE)
+    except OSError as e:
+        logger.warning("Could not save geocode cache: %s", e)
+
+def _load_route_cache() -> Dict[str, Dict[str, Any]]:
+    """
+    Load the route cache from disk on first use.
+    
+    Returns:
+        Dictionary mapping cache keys to timestamped route data
+    """
+    global _route_cache
+    
+    if _route_cache is None:
+        _route_cache = {}
+        if ROUTE_CACHE_FILE.exists():
+            try:
+                loaded = read_json(ROUTE_CACHE_FILE)
+            except (OSError, ValueError) as e:
+                logger.warning("Ignoring unreadable route cache: %s", e)
+            else:
+                if isinstance(loaded, dict):
+                    _route_cache = loaded
+                else:
+                    logger.warning("Ignoring route cache that is not a JSON object")
+        atexit.register(_save_route_cache)
+    
+    return _route_cache
+
+def _lookup_route(cache_key: str, ttl: int) -> Optional[RouteResponse]:
+    """
+    Look up a cached route that is younger than the given TTL.
+    
+    Args:
+        cache_key: Key identifying the origin/destination pair
+        ttl: Maximum age of the cached entry in seconds
+        
+    Returns:
+        Cached route data, or None if there is no fresh entry
+    """
+    global _route_cache_dirty
+    
+    route_cache = _load_route_cache()
+    entry = route_cache.get(cache_key)
+    if entry is None:
+        return None
+    
+    try:
+        # Entries without a travel time were written in an older format
+        if "travel_time" not in entry or time.time() - entry["timestamp"] >= ttl:
+            return None
+        
+        # Departure is now, not when the route was first fetched
+        route_data = RouteResponse.from_dict(entry["route"])
+        summary = route_data.summary
+        summary.departure_time, summary.arrival_time = _trip_times(entry["travel_time"])
+    except (KeyError, TypeError, AttributeError, ValueError) as e:
+        logger.warning("Dropping corrupt route cache entry for %s: %s", cache_key, e)
+        del route_cache[cache_key]
+        _route_cache_dirty = True
+        return None
+    
+    return route_data
+
+def _update_route(cache_key: str, route_data: RouteResponse, travel_time_seconds: int) -> None:
+    """
+    Store freshly fetched route data in the cache.
+    
+    Args:
+        cache_key: Key identifying the origin/destination pair
+        route_data: Render-ready route data to cache
+        travel_time_seconds: Travel time of the main route in seconds
+    """
+    global _route_cache_dirty
+    
+    _load_route_cache()[cache_key] = {
+        "timestamp": time.time(),
+        "travel_time": travel_time_seconds,
+        "route": route_data.to_dict(),
+    }
+    _route_cache_dirty = True
+
+def _save_route_cache() -> None:
+    """Write the route cache back to disk if it has changed."""
+    if _route_cache is None or not _route_cache_dirty:
+        return
+    
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        write_json(ROUTE_CACHE_FILE, _route_cache)
+    except OSError as e:
+        logger.warning("Could not save route cache: %s", e)
+
+def build_render_model(
     route_time: float, 
     route_distance: float, 
     all_routes: Dict[str, Tuple[float, float]], 
     origin: str, 
     destination: str
-) -> Dict[str, Any]:
+) -> RouteResponse:
     """
-    Transform the WazeRouteCalculator response to match our application's expected format.
+    Build the render-ready route information from a WazeRouteCalculator response.
     
     Args:
         route_time: Travel time in minutes
@@ -79,60 +706,98 @@ def _transform_waze_response(
         destination: Ending address
         
     Returns:
-        Transformed route data
+        Route information with a formatted summary, directions, traffic
+        conditions and any alternate routes
     """
-    try:
-        # Calculate arrival time
-        current_time = datetime.now()
-        travel_time_seconds = int(route_time * 60)  # Convert minutes to seconds
-        arrival_time = current_time + timedelta(seconds=travel_time_seconds)
-        
-        # Create directions based on the route
-        directions = _generate_directions(origin, destination)
-        
-        # Build alternate routes data
-        alternate_routes = []
-        
-        # Skip the first route as it's our main route
-        route_keys = list(all_routes.keys())
-        if len(route_keys) > 1:
-            for i, key in enumerate(route_keys[1:], 1):
-                alt_time, alt_distance = all_routes[key]
-                
-                # Extract a name for the route from the key
-                route_name = key.split('-')[-1] if '-' in key else f"Alternative route {i}"
-                
-                alternate_routes.append({
-                    "name": f"Alternative via {route_name}",
-                    "total_time": int(alt_time * 60),  # Convert to seconds
-                    "total_distance": int(alt_distance * 1000)  # Convert to meters
-                })
-        
-        # Create route data in our expected format
-        result = {
-            "routes": [
-                {
-                    "summary": {
-                        "totalLength": int(route_distance * 1000),  # Convert to meters
-                        "totalTime": travel_time_seconds,
-                        "arrivalTime": arrival_time.strftime("%H:%M"),
-                        "departureTime": current_time.strftime("%H:%M"),
-                    },
-                    "directions": directions,
-                    "traffic_conditions": _estimate_traffic_condition(route_time, route_distance)
-                }
-            ]
-        }
+    # Calculate departure and arrival time
+    travel_time_seconds = int(route_time * 60)  # Convert minutes to seconds
+    departure_time, arrival_time = _trip_times(travel_time_seconds)
+    
+    # Create directions based on the route
+    directions = _generate_directions(origin, destination)
+    
+    # Build alternate routes data, skipping the first route as it's our main route
+    alternate_routes = [
+        Route(
+            name=_alt_name(key, i),
+            total_time=_format_duration(int(alt_time * 60)),
+            total_distance=_format_distance(int(alt_distance * 1000)),
+        )
+        for i, (key, (alt_time, alt_distance)) in enumerate(itertools.islice(all_routes.items(), 1, None), 1)
+    ]
+    
+    # Create route data in the shape the CLI renders
+    return RouteResponse(
+        summary=RouteSummary(
+            total_time=_format_duration(travel_time_seconds),
+            total_distance=_format_distance(int(route_distance * 1000)),
+            departure_time=departure_time,
+            arrival_time=arrival_time,
+        ),
+        directions=directions,
+        traffic_conditions=_estimate_traffic_condition(route_time, route_distance),
+        alternate_routes=alternate_routes,
+    )
+
+def _alt_name(route_key: str, index: int) -> str:
+    """
+    Name an alternate route after the road in its route key.
+    
+    Args:
+        route_key: Route name as returned by calc_all_routes_info, e.g. "F-Mitchell Fwy"
+        index: Position of the route among the alternatives, starting at 1
         
-        # Add alternate routes if available
-        if alternate_routes:
-            result["routes"][0]["alternate_routes"] = alternate_routes
-            
-        return result
+    Returns:
+        Display name for the route
+    """
+    route_name = route_key.rpartition('-')[2] if '-' in route_key else f"Alternative route {index}"
+    return f"Alternative via {route_name}"
+
+def _format_duration(seconds: int) -> str:
+    """Format a travel time in seconds for display."""
+    return f"{seconds // 60} minutes"
+
+def _format_distance(meters: int) -> str:
+    """Format a distance in meters for display."""
+    return f"{meters / 1000:.1f} km"
+
+def _trip_times(travel_time_seconds: int) -> Tuple[str, str]:
+    """
+    Get departure and arrival times for a trip leaving now.
+    
+    Both times come from a single clock reading, so they can't drift apart.
+    
+    Args:
+        travel_time_seconds: Travel time in seconds
         
-    except Exception as e:
-        logger.error(f"Error transforming Waze response: {str(e)}")
-        return _get_mock_route_data(origin, destination)
+    Returns:
+        (departure, arrival) tuple formatted as HH:MM
+    """
+    now, departure = _now_hhmm()
+    arrival = time.localtime(now + travel_time_seconds)
+    
+    # Plain formatting is cheaper than strftime, which goes through the locale
+    return departure, f"{arrival.tm_hour:02d}:{arrival.tm_min:02d}"
+
+def _now_hhmm() -> Tuple[float, str]:
+    """
+    Get the current time and its HH:MM local time.
+    
+    The formatted time only changes once a minute, so it is cached until
+    the minute rolls over.
+    
+    Returns:
+        (seconds since the epoch, HH:MM) tuple
+    """
+    global _now_cache
+    
+    now = time.time()
+    minute = int(now // 60)
+    if minute != _now_cache[0]:
+        local = time.localtime(minute * 60)
+        _now_cache = (minute, f"{local.tm_hour:02d}:{local.tm_min:02d}")
+    
+    return now, _now_cache[1]
 
 def _generate_directions(origin: str, destination: str) -> list:
     """
@@ -145,34 +810,7 @@ def _generate_directions(origin: str, destination: str) -> list:
     Returns:
         List of direction steps
     """
-    # For known routes, return predefined directions
-    if origin == "91 Abbett St, Scarborough WA 6019" and destination == "11 Mount St, Perth WA 6000":
-        return [
-            "Head south on Abbett St toward Brighton Rd",
-            "Turn right onto Scarborough Beach Rd",
-            "Turn left onto West Coast Hwy",
-            "Continue onto Mounts Bay Rd",
-            "Turn right onto Mount St",
-            "Arrive at destination on left"
-        ]
-    elif origin == "11 Mount St, Perth WA 6000" and destination == "91 Abbett St, Scarborough WA 6019":
-        return [
-            "Head north on Mount St toward St Georges Terrace",
-            "Turn left onto Mounts Bay Rd",
-            "Continue onto West Coast Hwy",
-            "Turn right onto Scarborough Beach Rd",
-            "Turn left onto Abbett St",
-            "Arrive at destination on right"
-        ]
-    else:
-        # Generic directions for unknown routes
-        return [
-            "Start driving",
-            "Continue on the recommended route",
-            "Follow the main road",
-            "Continue to your destination",
-            "Arrive at destination"
-        ]
+    return list(_KNOWN_DIRECTIONS.get((origin, destination), _GENERIC_DIRECTIONS))
 
 def _estimate_traffic_condition(route_time: float, route_distance: float) -> str:
     """
@@ -189,16 +827,9 @@ def _estimate_traffic_condition(route_time: float, route_distance: float) -> str
     avg_speed = route_distance / (route_time / 60)
     
     # Estimate traffic based on average speed
-    if avg_speed < 30:
-        return "Heavy traffic"
-    elif avg_speed < 50:
-        return "Moderate traffic"
-    elif avg_speed < 70:
-        return "Light traffic with some congestion"
-    else:
-        return "Light traffic"
+    return _TRAFFIC_LABELS[bisect.bisect_right(_SPEED_THRESHOLDS, avg_speed)]
 
-def _get_mock_route_data(origin: str, destination: str) -> Dict[str, Any]:
+def _get_mock_route_data(origin: str, destination: str) -> RouteResponse:
     """
     Generate mock route data for demonstration purposes.
     Used as a fallback when the API request fails.
@@ -208,101 +839,90 @@ def _get_mock_route_data(origin: str, destination: str) -> Dict[str, Any]:
         destination: Ending address
         
     Returns:
-        Mock route data
+        Mock route information in the same shape as build_render_model
     """
     logger.warning("Using mock data instead of live API data")
     
-    # Calculate a realistic travel time based on the addresses
-    # For our specific locations in Perth, Australia
-    if (origin == "91 Abbett St, Scarborough WA 6019" and 
-        destination == "11 Mount St, Perth WA 6000"):
-        # Morning commute to work (more traffic)
-        travel_time_minutes = 69
-        distance_meters = 14200
-    elif (origin == "11 Mount St, Perth WA 6000" and 
-          destination == "91 Abbett St, Scarborough WA 6019"):
-        # Evening commute home
-        travel_time_minutes = 69
-        distance_meters = 14200
-    else:
-        # Generic calculation for unknown routes
-        travel_time_minutes = 69
-        distance_meters = 12000
+    # Realistic travel time, distance and directions for our specific
+    # locations in Perth, Australia
+    travel_time_minutes, distance_meters, directions = _MOCK_ROUTES.get(
+        (origin, destination), _DEFAULT_MOCK
+    )
+    
+    template = _mock_template(travel_time_minutes, distance_meters, directions)
     
     # Current time plus travel time
-    current_time = datetime.now()
-    arrival_time = current_time + timedelta(minutes=travel_time_minutes)
+    departure_time, arrival_time = _trip_times(travel_time_minutes * 60)
     
-    # Generate directions
-    directions = _generate_directions(origin, destination)
+    # Only the summary depends on the clock; the rest is shared between calls
+    return RouteResponse(
+        summary=RouteSummary(
+            total_time=template.summary.total_time,
+            total_distance=template.summary.total_distance,
+            departure_time=departure_time,
+            arrival_time=arrival_time,
+        ),
+        directions=list(template.directions),
+        traffic_conditions=template.traffic_conditions,
+        alternate_routes=list(template.alternate_routes),
+    )
+
+@functools.lru_cache(maxsize=8)
+def _mock_template(travel_time_minutes: int, distance_meters: int, directions: Tuple[str, ...]) -> RouteResponse:
+    """
+    Build the parts of a mock route that don't depend on the current time.
     
-    # Create mock route data
-    return {
-        "routes": [
-            {
-                "summary": {
-                    "totalLength": distance_meters,
-                    "totalTime": travel_time_minutes * 60,  # In seconds
-                    "arrivalTime": arrival_time.strftime("%H:%M"),
-                    "departureTime": current_time.strftime("%H:%M"),
-                },
-                "directions": directions,
-                "traffic_conditions": "Light to moderate traffic",
-                "alternate_routes": [
-                    {
-                        "name": "Alternative via Mitchell Freeway",
-                        "total_time": (travel_time_minutes + 5) * 60,
-                        "total_distance": distance_meters + 2000,
-                    },
-                    {
-                        "name": "Alternative via inland roads",
-                        "total_time": (travel_time_minutes + 8) * 60,
-                        "total_distance": distance_meters - 1000,
-                    }
-                ]
-            }
-        ]
-    }
+    Args:
+        travel_time_minutes: Travel time in minutes
+        distance_meters: Distance in meters
+        directions: Turn-by-turn directions
+        
+    Returns:
+        Mock route information with blank departure and arrival times
+    """
+    return RouteResponse(
+        summary=RouteSummary(
+            total_time=_format_duration(travel_time_minutes * 60),
+            total_distance=_format_distance(distance_meters),
+            departure_time="",
+            arrival_time="",
+        ),
+        directions=list(directions),
+        traffic_conditions="Light to moderate traffic",
+        alternate_routes=(
+            Route(
+                name="Alternative via Mitchell Freeway",
+                total_time=_format_duration((travel_time_minutes + 5) * 60),
+                total_distance=_format_distance(distance_meters + 2000),
+            ),
+            Route(
+                name="Alternative via inland roads",
+                total_time=_format_duration((travel_time_minutes + 8) * 60),
+                total_distance=_format_distance(distance_meters - 1000),
+            ),
+        ),
+    )
 
-def format_route_info(route_data: Dict[str, Any]) -> Dict[str, Any]:
+def format_route_info(route_data: Any) -> Dict[str, Any]:
     """
-    Format the route data into a more readable format.
+    Format route data for display.
+    
+    get_route already returns render-ready data, so this only exists for
+    callers written against the older two-step API, which expect a dict.
     
     Args:
-        route_data: Raw route data from the API
+        route_data: Route information from get_route
         
     Returns:
         Formatted route information
     """
-    if not route_data or "routes" not in route_data or not route_data["routes"]:
+    if isinstance(route_data, RouteResponse):
+        return route_data.to_dict()
+    
+    if not route_data or "status" not in route_data:
         return {
             "status": "error",
             "message": "No route found"
         }
     
-    route = route_data["routes"][0]
-    
-    formatted_info = {
-        "status": "success",
-        "summary": {
-            "total_time": f"{route['summary']['totalTime'] // 60} minutes",
-            "total_distance": f"{route['summary']['totalLength'] / 1000:.1f} km",
-            "departure_time": route['summary']['departureTime'],
-            "arrival_time": route['summary']['arrivalTime'],
-        },
-        "directions": route["directions"],
-        "traffic_conditions": route.get("traffic_conditions", "Unknown"),
-    }
-    
-    # Add alternative routes if available
-    if "alternate_routes" in route:
-        alt_routes = []
-        for alt in route["alternate_routes"]:
-            alt_routes.append({
-                "name": alt["name"],
-                "total_time": f"{alt['total_time'] // 60} minutes",
-                "total_distance": f"{alt['total_distance'] / 1000:.1f} km",
-            })
-        formatted_info["alternate_routes"] = alt_routes
-    
-    return formatted_info
\ No newline at end of file
+    return route_data